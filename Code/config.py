@@ -90,8 +90,8 @@ class Config:
     }
     PROJECT_ANALYSIS_OUTPUT = "ProjectAnalysis.xlsx"
     PROJECT_ANALYSIS_REGEX = {
-        "budget": r"6\*\s*(.*?)\s*PRJ(.*)",
-        "plan": r"6\*\s*PRJ\s*([A-Za-z0-9\-]{12})\s*(.*)",
+        "budget": r"6\*\s*(.*?)\s*PRJ\s*(.*?)\s*$",
+        "plan": r"6\*\s*PRJ\s*([A-Za-z0-9\-]{12})\s*(.*?)\s*$",
     }
 
     # Year End 558 Settings
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-16 22:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0002_reporthistory'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wbselement',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, help_text='When the WBS element was last written.'),
+        ),
+    ]
@@ -39,6 +39,7 @@ class WBSElement(models.Model):
     """
     wbs_element = models.CharField(max_length=255, unique=True, db_index=True, help_text="The unique identifier for the WBS element.")
     name = models.CharField(max_length=255, help_text="The descriptive name of the WBS element.")
+    updated_at = models.DateTimeField(auto_now=True, db_index=True, help_text="When the WBS element was last written.")
     
     def __str__(self):
         return self.wbs_element
@@ -162,34 +162,37 @@ def generate_formatted_html(df, summary_wbs_list):
     # Table body
     html_parts.append('<tbody>')
 
-    for idx, row in df.iterrows():
+    # Rows come out as plain tuples, which are much cheaper to build than
+    # the Series iterrows creates for every row
+    columns = list(df.columns)
+    id_pos = columns.index(id_column) if id_column else None
+    summary_wbs = set(summary_wbs_list or ())
+
+    for row in df.itertuples(index=False, name=None):
         # Check if this row is a summary WBS
         row_class = ''
-        if id_column and summary_wbs_list:
-            wbs_value = row.get(id_column, '')
-            if wbs_value in summary_wbs_list:
-                row_class = ' class="summary-wbs"'
-
-        html_parts.append(f'<tr{row_class}>')
-
-        for col in df.columns:
-            value = row[col]
+        if id_pos is not None and row[id_pos] in summary_wbs:
+            row_class = ' class="summary-wbs"'
 
+        # Cells are collected per row and joined into a single row string,
+        # so html_parts grows by one entry per row rather than per cell
+        cells = []
+        for col, value in zip(columns, row):
             if col in currency_columns:
                 # Format as Indian currency
                 formatted_value = format_indian_currency(value)
                 cell_class = 'currency-cell'
                 if formatted_value.startswith('-'):
                     cell_class += ' negative'
-                html_parts.append(f'<td class="{cell_class}">{formatted_value}</td>')
+                cells.append(f'<td class="{cell_class}">{formatted_value}</td>')
             elif col == 'Sl No.':
                 # Center align serial numbers
-                html_parts.append(f'<td class="center-cell">{value}</td>')
+                cells.append(f'<td class="center-cell">{value}</td>')
             else:
                 # Text columns - left align
-                html_parts.append(f'<td class="text-cell">{value if pd.notna(value) else ""}</td>')
+                cells.append(f'<td class="text-cell">{value if pd.notna(value) else ""}</td>')
 
-        html_parts.append('</tr>')
+        html_parts.append(f'<tr{row_class}>' + ''.join(cells) + '</tr>')
 
     html_parts.append('</tbody>')
     html_parts.append('</table>')
@@ -432,7 +435,7 @@ class BudgetUpdatesExcelFormatter:
             self._highlight_summary_rows(summary_wbs_list, id_col_idx)
             self._adjust_column_widths()
 
-        self.workbook.save(self.output_file)
+        # ExcelWriter saves the workbook when the block exits
         return self.output_file
 
     def _apply_freeze_panes(self):
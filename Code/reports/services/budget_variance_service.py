@@ -10,17 +10,45 @@ KEY DIFFERENCES FROM OTHER REPORTS:
 - Removes trailing '1' characters from column headers
 - Freeze panes at D3 (not E3)
 """
+import importlib.util
 import os
+import shutil
+import warnings
+from itertools import islice, repeat
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import openpyxl
-from openpyxl.styles import NamedStyle, PatternFill, Font, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import PatternFill, Font, Border, Side, Alignment
 from openpyxl.utils import get_column_letter
 import re
 
 from django.conf import settings
-from .data_processing import BaseDataProcessor, WBSProcessor, MasterDataManager
+from .data_processing import (
+    BaseDataProcessor,
+    WBSProcessor,
+    MasterDataManager,
+    CHILD_WBS_PATTERN,
+)
 from .error_handling import handle_error, ExcelGenerationError
+from .formatting import set_default_font
+
+
+# lxml is the fast read_html parser; when it is not installed let pandas fall
+# back to whichever of its other flavors is available
+READ_HTML_FLAVOR = "lxml" if importlib.util.find_spec("lxml") else None
+
+# Column names that hold text rather than amounts in the HTML table
+NON_CURRENCY_COLUMN_PATTERN = re.compile(r"wbs|description|element", re.IGNORECASE)
+
+# Opening cell markup per column kind; negative currency cells are flagged
+HTML_CELL_OPENERS = {
+    'currency': '<td class="currency-cell">',
+    'negative': '<td class="currency-cell negative">',
+    'center': '<td class="center-cell">',
+    'text': '<td class="text-cell">',
+}
 
 
 def format_indian_currency(value):
@@ -63,12 +91,10 @@ def generate_formatted_html(df, summary_wbs_list):
     """Generate a professionally formatted HTML table with Indian currency formatting."""
     # Identify currency columns
     non_currency_cols = ['SI_NO']
-    currency_columns = []
-
-    for col in df.columns:
-        col_lower = str(col).lower()
-        if col not in non_currency_cols and not any(x in col_lower for x in ['wbs', 'description', 'element']):
-            currency_columns.append(col)
+    currency_columns = [
+        col for col in df.columns
+        if col not in non_currency_cols and not NON_CURRENCY_COLUMN_PATTERN.search(str(col))
+    ]
 
     # Find the WBS column for highlighting
     wbs_column = None
@@ -77,6 +103,8 @@ def generate_formatted_html(df, summary_wbs_list):
             wbs_column = col
             break
 
+    summary_wbs_set = set(summary_wbs_list or [])
+
     # Build HTML table
     html_parts = []
 
@@ -150,32 +178,33 @@ def generate_formatted_html(df, summary_wbs_list):
     # Table body
     html_parts.append('<tbody>')
 
-    for idx, row in df.iterrows():
-        # Check if this row is a summary WBS
-        row_class = ''
-        if wbs_column and summary_wbs_list:
-            wbs_value = row.get(wbs_column, '')
-            if wbs_value in summary_wbs_list:
-                row_class = ' class="summary-wbs"'
-
-        html_parts.append(f'<tr{row_class}>')
-
-        for col in df.columns:
-            value = row[col]
-
-            if col in currency_columns:
-                formatted_value = format_indian_currency(value)
-                cell_class = 'currency-cell'
-                if formatted_value.startswith('-'):
-                    cell_class += ' negative'
-                html_parts.append(f'<td class="{cell_class}">{formatted_value}</td>')
-            elif col == 'SI_NO':
-                html_parts.append(f'<td class="center-cell">{value}</td>')
-            else:
-                html_parts.append(f'<td class="text-cell">{value if pd.notna(value) else ""}</td>')
+    # Pre-format every column into finished cell markup, so the body is
+    # built by joining ready-made cells instead of formatting row by row
+    cell_columns = []
+    for col in df.columns:
+        values = df[col]
+        if col in currency_columns:
+            # Build the cell once per distinct value instead of per cell
+            lookup = {}
+            for value in values.dropna().unique():
+                formatted = format_indian_currency(value)
+                kind = 'negative' if formatted.startswith('-') else 'currency'
+                lookup[value] = f"{HTML_CELL_OPENERS[kind]}{formatted}</td>"
+            cells = values.map(lookup).fillna(f"{HTML_CELL_OPENERS['currency']}</td>")
+        elif col == 'SI_NO':
+            cells = HTML_CELL_OPENERS['center'] + values.astype(str) + '</td>'
+        else:
+            cells = HTML_CELL_OPENERS['text'] + values.fillna('').astype(str) + '</td>'
+        cell_columns.append(cells.tolist())
 
-        html_parts.append('</tr>')
+    # Check which rows are summary WBS
+    if wbs_column is not None and summary_wbs_set:
+        is_summary = df[wbs_column].isin(summary_wbs_set)
+        row_openers = np.where(is_summary, '<tr class="summary-wbs">', '<tr>').tolist()
+    else:
+        row_openers = ['<tr>'] * len(df)
 
+    html_parts.append(''.join(map(''.join, zip(row_openers, *cell_columns, repeat('</tr>')))))
     html_parts.append('</tbody>')
     html_parts.append('</table>')
     html_parts.append('</div>')
@@ -207,8 +236,9 @@ class BudgetVarianceProcessor(BaseDataProcessor):
             self.logger.warning(f"File does not have .html extension: {file_path}")
 
         try:
+            # Only the first few lines are needed to check the length
             with open(file_path, "r", encoding="utf-8") as file:
-                lines = file.readlines()
+                lines = list(islice(file, 3))
                 if len(lines) < 3:
                     raise ValueError("HTML file has too few lines to be valid")
         except Exception as e:
@@ -221,33 +251,35 @@ class BudgetVarianceProcessor(BaseDataProcessor):
         """Removes the first TWO lines from the HTML file (Budget Variance specific)."""
         cleaned_html_path = self.input_file_path.parent / f"cleaned_{self.input_file_path.name}"
 
-        with open(self.input_file_path, "r", encoding="utf-8") as file:
-            lines = file.readlines()
-
-        if len(lines) > 2:
-            with open(cleaned_html_path, "w", encoding="utf-8") as file:
-                file.writelines(lines[2:])  # Remove first two lines
-            self.logger.info(f"Cleaned HTML saved as {cleaned_html_path}")
-        else:
-            self.logger.warning("File doesn't have enough lines to clean.")
-            # Write original content if not enough lines
-            with open(cleaned_html_path, "w", encoding="utf-8") as file:
-                file.writelines(lines)
+        # Stream the file so large exports are never held in memory at once
+        with open(self.input_file_path, "r", encoding="utf-8") as source, \
+                open(cleaned_html_path, "w", encoding="utf-8") as target:
+            first_lines = [source.readline(), source.readline()]
+            next_line = source.readline()
+
+            if next_line:
+                # Remove first two lines
+                target.write(next_line)
+                shutil.copyfileobj(source, target)
+                self.logger.info(f"Cleaned HTML saved as {cleaned_html_path}")
+            else:
+                self.logger.warning("File doesn't have enough lines to clean.")
+                # Write original content if not enough lines
+                target.writelines(first_lines)
 
         return str(cleaned_html_path)
 
     def read_html_data(self, cleaned_html):
         """Reads the cleaned HTML into a Pandas DataFrame."""
-        # pd.read_html returns a list of DataFrames, take the first one
-        df = pd.read_html(cleaned_html, header=[0, 1], encoding="utf-8")[0]
+        # The SAP export is a single flat table; the lxml flavor skips the
+        # bs4/html5lib fallback and raises ValueError when no table is found
+        df = pd.read_html(
+            cleaned_html, header=[0, 1], encoding="utf-8", flavor=READ_HTML_FLAVOR
+        )[0]
 
         # Flatten multi-level columns
         df.columns = df.columns.map(lambda x: " ".join(map(str, x)).strip())
 
-        # Drop the last row if it exists (usually totals)
-        if len(df) > 0:
-            df = df.drop(df.index[-1])
-
         return df
 
     def process_data(self, file_path: str) -> pd.DataFrame:
@@ -267,8 +299,12 @@ class BudgetVarianceProcessor(BaseDataProcessor):
                 df["WBS_element"].astype(str).str.strip().fillna("")
             )
 
-        # Drop completely empty rows
-        df = df.dropna(how="all")
+        # Drop completely empty rows and the last row (usually totals) in a
+        # single selection
+        keep_rows = df.notna().any(axis=1)
+        if len(keep_rows) > 0:
+            keep_rows.iloc[-1] = False
+        df = df[keep_rows]
 
         # Process WBS classification
         self.summary_wbs_list, self.transaction_wbs_list = self.process_wbs(
@@ -283,26 +319,19 @@ class BudgetVarianceProcessor(BaseDataProcessor):
 
     def process_wbs(self, wbs_list):
         """Classifies WBS elements into summary and transaction WBS."""
-        summary_wbs = []
-        transaction_wbs_set = set(wbs for wbs in wbs_list if wbs and str(wbs).strip())
-
-        for wbs in wbs_list:
-            if not wbs or not str(wbs).strip():
-                continue
-
-            wbs_str = str(wbs).strip()
-
-            # Check for any child WBS in the range -01 to -99
-            is_parent = False
-            for i in range(1, 100):
-                child_wbs = f"{wbs_str}-{i:02d}"
-                if child_wbs in transaction_wbs_set:
-                    is_parent = True
-                    break
-
-            if is_parent:
-                summary_wbs.append(wbs_str)
-
+        # WBS elements arrive already stripped from process_data
+        wbs_list = [wbs for wbs in wbs_list if wbs]
+        transaction_wbs_set = set(wbs_list)
+
+        # Collect parents from their children in a single pass: any WBS ending
+        # in a -01 to -99 suffix marks its prefix as a summary WBS
+        parent_wbs_set = set()
+        for wbs in transaction_wbs_set:
+            match = CHILD_WBS_PATTERN.match(wbs)
+            if match and not wbs.endswith("-00"):
+                parent_wbs_set.add(match.group(1))
+
+        summary_wbs = [wbs for wbs in wbs_list if wbs in parent_wbs_set]
         return summary_wbs, list(transaction_wbs_set)
 
 
@@ -332,21 +361,26 @@ class BudgetVarianceExcelFormatter:
             if col_str.endswith('1'):
                 col_str = col_str.rstrip('1').strip()
             cleaned_columns.append(col_str)
+        # Relabel a shallow copy so the caller's frame keeps its headers
+        # without duplicating the data blocks
+        self.df = self.df.copy(deep=False)
         self.df.columns = cleaned_columns
 
-        # Write to Excel
-        with pd.ExcelWriter(self.output_file, engine='openpyxl') as writer:
-            self.df.to_excel(writer, index=False, sheet_name='Budget Variance')
-            self.workbook = writer.book
-            self.worksheet = writer.sheets['Budget Variance']
+        # Stream the sheet through a write-only workbook: cells are styled as
+        # each row is appended instead of being revisited after the write
+        self.workbook = openpyxl.Workbook(write_only=True)
+        # Bookman Old Style is the default font; it must be set before any
+        # data is written
+        set_default_font(self.workbook, Font(name="Bookman Old Style", size=12))
+        self.worksheet = self.workbook.create_sheet('Budget Variance')
+
+        # Sheet settings must be in place before the first row is appended
+        self._apply_freeze_panes()
+        self._adjust_column_widths()
 
-            self._apply_freeze_panes()
-            self._apply_font_style()
-            self._apply_currency_formatting()
-            self._apply_header_format()
-            self._highlight_summary_rows(summary_wbs_list, wbs_col_idx)
-            self._adjust_column_widths()
-            self._create_table()
+        self._write_header_row()
+        self._write_data_rows(summary_wbs_list, wbs_col_idx)
+        self._create_table()
 
         self.workbook.save(self.output_file)
         return self.output_file
@@ -355,29 +389,8 @@ class BudgetVarianceExcelFormatter:
         """Freeze panes at D3 (Budget Variance specific)."""
         self.worksheet.freeze_panes = "D3"
 
-    def _apply_font_style(self):
-        """Apply Bookman Old Style font to all cells."""
-        font = Font(name="Bookman Old Style", size=12)
-        for row in self.worksheet.iter_rows():
-            for cell in row:
-                cell.font = font
-
-    def _apply_currency_formatting(self):
-        """Apply Indian currency formatting to numeric columns (starting from column 3)."""
-        currency_style = NamedStyle(
-            name="currency_variance",
-            font=Font(name="Bookman Old Style", size=12),
-            number_format="₹ #,##0.00;[Red]₹ -#,##0.00",
-        )
-
-        for col in range(3, self.worksheet.max_column + 1):
-            col_letter = get_column_letter(col)
-            for cell in self.worksheet[col_letter][1:]:  # Skip header
-                if isinstance(cell.value, (int, float)):
-                    cell.style = currency_style
-
-    def _apply_header_format(self):
-        """Apply yellow header format with borders."""
+    def _write_header_row(self):
+        """Write the header row in yellow with borders."""
         yellow_fill = PatternFill(
             start_color="FFFF00", end_color="FFFF00", fill_type="solid"
         )
@@ -388,50 +401,87 @@ class BudgetVarianceExcelFormatter:
             bottom=Side(style="thin", color="000000"),
         )
         bold_font = Font(name="Bookman Old Style", size=12, bold=True)
+        # Same alignment pandas gives to header cells
+        alignment = Alignment(horizontal="center", vertical="top")
 
-        # Apply to header row
-        for col in range(1, self.worksheet.max_column + 1):
-            cell = self.worksheet.cell(row=1, column=col)
+        header_cells = []
+        for header in self.df.columns:
+            cell = WriteOnlyCell(self.worksheet, value=header)
             cell.fill = yellow_fill
             cell.border = black_border
             cell.font = bold_font
-
-    def _highlight_summary_rows(self, summary_wbs_list: list, wbs_col_idx: int):
-        """Highlight rows containing summary WBS elements in ORANGE (Budget Variance specific)."""
-        if not summary_wbs_list or wbs_col_idx == -1:
-            return
+            cell.alignment = alignment
+            header_cells.append(cell)
+        self.worksheet.append(header_cells)
+
+    def _write_data_rows(self, summary_wbs_list: list, wbs_col_idx: int):
+        """
+        Write the data rows, applying Indian currency formatting to numeric
+        values (starting from column 3) and highlighting rows containing
+        summary WBS elements in ORANGE (Budget Variance specific).
+        """
+        currency_format = settings.CURRENCY_FORMAT
+        # Numbers are formatted by position, so amounts in mixed text/number
+        # columns are formatted as well
+        currency_start = 2
 
         # ORANGE highlighting for Budget Variance
         orange_fill = PatternFill(
             start_color="FFA500", end_color="FFA500", fill_type="solid"
         )
-
-        for row in self.worksheet.iter_rows(min_row=2, max_row=self.worksheet.max_row):
-            cell = row[wbs_col_idx - 1]
-            if cell.value in summary_wbs_list:
-                for cell_in_row in row:
-                    cell_in_row.fill = orange_fill
+        summary_wbs_set = frozenset(summary_wbs_list or ())
+        wbs_pos = wbs_col_idx - 1 if summary_wbs_set and wbs_col_idx != -1 else None
+
+        for row in self.df.itertuples(index=False, name=None):
+            highlight = wbs_pos is not None and row[wbs_pos] in summary_wbs_set
+            cells = []
+            for col, value in enumerate(row):
+                if pd.isna(value):
+                    value = None
+                is_currency = col >= currency_start and isinstance(value, (int, float))
+                # Plain values are written unstyled; only styled cells need a
+                # WriteOnlyCell, which is also kept for blanks in summary rows
+                if highlight or is_currency:
+                    value = WriteOnlyCell(self.worksheet, value=value)
+                    if highlight:
+                        value.fill = orange_fill
+                    if is_currency:
+                        value.number_format = currency_format
+                cells.append(value)
+            self.worksheet.append(cells)
 
     def _adjust_column_widths(self):
         """Auto-adjust column widths based on content."""
-        for col in range(1, self.worksheet.max_column + 1):
-            col_letter = get_column_letter(col)
-            max_length = max(
-                (
-                    len(str(cell.value))
-                    for cell in self.worksheet[col_letter]
-                    if cell.value
-                ),
-                default=10,
-            )
-            self.worksheet.column_dimensions[col_letter].width = max_length + 10
+        # Measure the DataFrame that was written rather than re-reading every
+        # cell; empty and zero values are skipped just like blank cells
+        for col, header in enumerate(self.df.columns, start=1):
+            values = self.df.iloc[:, col - 1]
+            values = values[values.notna() & values.astype(bool)]
+
+            lengths = [len(str(header))] if header else []
+            if not values.empty:
+                lengths.append(values.astype(str).str.len().max())
+
+            max_length = max(lengths, default=10)
+            self.worksheet.column_dimensions[get_column_letter(col)].width = max_length + 10
 
     def _create_table(self):
         """Create a formatted table."""
-        data_range = f"A1:{self.worksheet.cell(row=self.worksheet.max_row, column=self.worksheet.max_column).coordinate}"
-        from openpyxl.worksheet.table import Table, TableStyleInfo
-
-        table = Table(displayName="Table1", ref=data_range)
+        data_range = f"A1:{get_column_letter(len(self.df.columns))}{len(self.df) + 1}"
+        from openpyxl.worksheet.filters import AutoFilter
+        from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
+
+        # Write-only sheets cannot be read back, so the table columns are
+        # named from the DataFrame headers
+        table = Table(
+            displayName="Table1",
+            ref=data_range,
+            autoFilter=AutoFilter(ref=data_range),
+            tableColumns=[
+                TableColumn(id=idx, name=str(header))
+                for idx, header in enumerate(self.df.columns, start=1)
+            ],
+        )
         table.tableStyleInfo = TableStyleInfo(
             name="TableStyleMedium9",
             showFirstColumn=False,
@@ -439,7 +489,15 @@ class BudgetVarianceExcelFormatter:
             showRowStripes=True,
             showColumnStripes=False,
         )
-        self.worksheet.add_table(table)
+        with warnings.catch_warnings():
+            # openpyxl warns on every write-only table, even when the
+            # columns have been supplied as above
+            warnings.filterwarnings(
+                "ignore",
+                message="In write-only mode you must add table columns manually",
+                category=UserWarning,
+            )
+            self.worksheet.add_table(table)
 
 
 @handle_error
@@ -475,7 +533,7 @@ def generate_budget_variance_report(uploaded_file_path: str) -> dict:
     output_path = str(reports_dir / output_filename)
 
     # Format and save Excel file
-    formatter = BudgetVarianceExcelFormatter(df.copy(), output_path)
+    formatter = BudgetVarianceExcelFormatter(df, output_path)
     formatted_file_path = formatter.format_and_save(summary_wbs)
 
     # Clean up temporary file
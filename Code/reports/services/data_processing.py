@@ -3,10 +3,13 @@ Provides consistent data processing patterns across all modules
 """
 
 from django.conf import settings
+from django.db.models import Count, Max
 import logging
 import pandas as pd
 import re
 from abc import ABC, abstractmethod
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 from .error_handling import (
@@ -146,6 +149,14 @@ class BaseDataProcessor(ABC):
             )
 
 
+# Captures the parent of a child WBS element such as 'P-100-01', whose
+# suffix is the configured child pattern
+CHILD_WBS_PATTERN = re.compile(r"^(.+)(?:" + settings.REGEX_PATTERNS["wbs_child"] + r")$")
+
+# Recognises WBS level markers such as '**'
+WBS_LEVEL_PATTERN = re.compile(settings.REGEX_PATTERNS["wbs_levels"])
+
+
 class WBSProcessor:
     """Enhanced WBS (Work Breakdown Structure) processing utilities."""
 
@@ -167,38 +178,23 @@ class WBSProcessor:
             self.logger.warning("Empty WBS list provided")
             return [], []
 
-        summary_wbs = []
-        transaction_wbs = []
-
         # Remove duplicates while preserving order
         unique_wbs = list(dict.fromkeys(wbs_list))
 
         self.logger.info(f"Classifying WBS elements: {len(unique_wbs)} total elements")
 
-        for wbs in unique_wbs:
-            if not wbs or pd.isna(wbs):
-                continue
-
-            wbs_str = str(wbs).strip()
-            if not wbs_str:
-                continue
-
-            # Create regex pattern for child detection
-            pattern = re.compile(
-                re.escape(wbs_str) + settings.REGEX_PATTERNS["wbs_child"]
-            )
+        wbs_series = pd.Series(unique_wbs, dtype=object)
+        wbs_series = wbs_series[wbs_series.notna() & wbs_series.astype(bool)]
+        wbs_series = wbs_series.astype(str).str.strip()
+        wbs_series = wbs_series[wbs_series != ""]
 
-            # Check for child elements
-            has_child = any(
-                pattern.fullmatch(str(item).strip())
-                for item in unique_wbs
-                if item != wbs and item and not pd.isna(item)
-            )
+        # Derive every parent from its children with one vectorised regex
+        # pass instead of matching each element against all the others
+        parent_wbs = set(wbs_series.str.extract(CHILD_WBS_PATTERN)[0].dropna())
 
-            if has_child:
-                summary_wbs.append(wbs_str)
-            else:
-                transaction_wbs.append(wbs_str)
+        is_summary = wbs_series.isin(parent_wbs)
+        summary_wbs = wbs_series[is_summary].tolist()
+        transaction_wbs = wbs_series[~is_summary].tolist()
 
         self.logger.info(
             f"WBS classification completed: {len(summary_wbs)} summary, {len(transaction_wbs)} transaction"
@@ -221,29 +217,24 @@ class WBSProcessor:
         descriptions = []
         ids = []
 
-        level_patterns = settings.REGEX_PATTERNS["wbs_levels"]
-
-        for detail in wbs_detail_series:
-            if pd.isna(detail) or not str(detail).strip():
-                levels.append("")
-                descriptions.append("")
-                ids.append("")
-                continue
+        # Compiled once at import instead of looked up by re.match per element
+        match_level = WBS_LEVEL_PATTERN.match
 
+        for detail in wbs_detail_series.fillna("").astype(str):
             # Split detail string
-            parts = str(detail).split()
+            parts = detail.split()
             if len(parts) < 2:
                 levels.append("")
-                descriptions.append(str(detail))
+                descriptions.append(detail if parts else "")
                 ids.append("")
                 continue
 
             level = parts[0]
-            description = " ".join(parts[1:-1]) if len(parts) > 2 else ""
+            description = " ".join(parts[1:-1])
             wbs_id = parts[-1]
 
             # Check if level matches pattern
-            if not re.match(level_patterns, level):
+            if not match_level(level):
                 description = level + " " + description
                 level = ""
 
@@ -254,6 +245,30 @@ class WBSProcessor:
         return {"level": levels, "description": descriptions, "id": ids}
 
 
+@lru_cache(maxsize=1)
+def _load_wbs_mapping(version_token: Tuple[int, Optional[datetime]]) -> Dict[str, str]:
+    """
+    Load the WBS element -> name mapping for one version of the master data.
+
+    The mapping is kept for the life of the process and only fetched again
+    when the version token changes.
+    """
+    # Stream the rows in chunks rather than materialising the whole queryset
+    rows = WBSElement.objects.values_list('wbs_element', 'name').iterator(chunk_size=2000)
+    return dict(rows)
+
+
+def _wbs_master_data_version() -> Tuple[int, Optional[datetime]]:
+    """
+    Cheap token that changes whenever the WBS master data is written.
+
+    Saves and inserts bump ``updated_at`` and deletes change the count, so
+    every process sees the change on its next report without any signal.
+    """
+    stats = WBSElement.objects.aggregate(count=Count('pk'), last_update=Max('updated_at'))
+    return stats['count'], stats['last_update']
+
+
 class MasterDataManager:
     """Manages master data integration and mapping."""
 
@@ -330,8 +345,8 @@ class MasterDataManager:
             # Return DataFrame unchanged
             return transaction_df
 
-        # Create mapping dictionary directly from the Django model
-        mapping_dict = dict(WBSElement.objects.values_list('wbs_element', 'name'))
+        # Reuse the mapping from earlier reports unless the master data changed
+        mapping_dict = _load_wbs_mapping(_wbs_master_data_version())
 
         if not mapping_dict:
             self.logger.warning("WBS master data is empty. No descriptions will be mapped.")
@@ -339,11 +354,22 @@ class MasterDataManager:
 
         # Apply mapping
         if wbs_column in transaction_df.columns:
-            transaction_df[description_column] = (
-                transaction_df[wbs_column]
-                .map(mapping_dict)
-                .fillna(transaction_df.get(description_column, ""))
-            )
+            wbs_values = transaction_df[wbs_column]
+
+            # Series.map converts the whole dict to a Series, so only pass the
+            # master entries this report actually uses
+            used_mapping = {
+                wbs: mapping_dict[wbs] for wbs in wbs_values.unique() if wbs in mapping_dict
+            }
+
+            if used_mapping:
+                transaction_df[description_column] = (
+                    wbs_values
+                    .map(used_mapping)
+                    .fillna(transaction_df.get(description_column, ""))
+                )
+            elif description_column not in transaction_df.columns:
+                transaction_df[description_column] = ""
 
             mapped_count = transaction_df[description_column].notna().sum()
             unmapped_count = len(transaction_df) - mapped_count
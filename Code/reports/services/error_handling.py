@@ -3,11 +3,10 @@ Enhanced Error Handling and Logging System for Django
 Provides comprehensive error management for the reports services.
 """
 
+import functools
 import logging
-import traceback
-from pathlib import Path
-from datetime import datetime
-from typing import Optional, Any
+import os
+import stat
 
 # This file is adapted from the original error_handler.py for use in a Django environment.
 # The GUI-specific components (PySide6) have been removed.
@@ -50,6 +49,7 @@ def handle_error(func):
     """
     logger = logging.getLogger(func.__module__)
 
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
@@ -71,12 +71,14 @@ def handle_error(func):
 
 def validate_file_exists(file_path: str, file_description: str = "File"):
     """Validate that a file exists and is readable."""
-    path = Path(file_path)
-    if not path.exists():
+    # A single stat answers both existence and file type
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
         raise FileProcessingError(
             f"{file_description} not found: {file_path}", "FILE_NOT_FOUND"
         )
-    if not path.is_file():
+    if not stat.S_ISREG(file_stat.st_mode):
         raise FileProcessingError(
             f"{file_description} is not a valid file: {file_path}", "INVALID_FILE"
         )
@@ -94,11 +96,14 @@ def validate_data_format(df, expected_columns: list = None, min_rows: int = 1):
             "INSUFFICIENT_DATA",
         )
 
-    if expected_columns and not all(col in df.columns for col in expected_columns):
+    if expected_columns:
+        # Index membership is a hash lookup and, unlike a plain set, still
+        # accepts top-level keys of MultiIndex columns
         missing_cols = [col for col in expected_columns if col not in df.columns]
-        raise DataValidationError(
-            f"Missing required columns: {missing_cols}", "MISSING_COLUMNS"
-        )
+        if missing_cols:
+            raise DataValidationError(
+                f"Missing required columns: {missing_cols}", "MISSING_COLUMNS"
+            )
 
     return True
 
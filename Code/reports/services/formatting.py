@@ -4,21 +4,122 @@ Provides consistent, professional Excel formatting across all report services
 """
 
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import NamedStyle, PatternFill, Font, Border, Side, Alignment
 from openpyxl.utils import get_column_letter
-from openpyxl.worksheet.table import Table, TableStyleInfo
+from openpyxl.utils.indexed_list import IndexedList
+from openpyxl.worksheet.filters import AutoFilter
+from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
 from openpyxl.worksheet.worksheet import Worksheet
 from openpyxl.worksheet.datavalidation import DataValidation
 from openpyxl.chart import BarChart3D, Reference
-from typing import List, Dict, Optional, Union
+from typing import List, Dict, Optional, Tuple, Union
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
 import logging
+import warnings
+import numpy as np
 import pandas as pd
 
 from django.conf import settings
 from .error_handling import handle_error, ExcelGenerationError
 
 
+# Style primitives shared by every formatter; cells only keep a reference,
+# so one instance serves the whole sheet
+THIN_BORDER = Border(
+    left=Side(style="thin", color="000000"),
+    right=Side(style="thin", color="000000"),
+    top=Side(style="thin", color="000000"),
+    bottom=Side(style="thin", color="000000"),
+)
+
+
+@lru_cache(maxsize=None)
+def _solid_fill(color: str) -> PatternFill:
+    """Return the shared solid fill for a colour."""
+    return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+
+def set_default_font(workbook: openpyxl.Workbook, font: Font):
+    """
+    Make ``font`` the font of every cell in ``workbook`` that has none of its own.
+
+    openpyxl has no public setting for this: cells without a font use the
+    workbook's first font and the "Normal" named style. Reports call this
+    helper, so it is the only place relying on those internals.
+    """
+    workbook._fonts = IndexedList([font, *workbook._fonts[1:]])
+    workbook._named_styles["Normal"].font = font
+
+
+@lru_cache(maxsize=None)
+def _build_named_style_attributes(
+    font_items: tuple, currency_format: str, header_color: str, header_fill: str
+) -> Dict[str, dict]:
+    """Build the attributes of the report named styles for one configuration."""
+    font = dict(font_items)
+    return {
+        "currency_style": dict(
+            font=Font(**font),
+            number_format=currency_format,
+            alignment=Alignment(horizontal="right"),
+        ),
+        "header_style": dict(
+            font=Font(
+                name=font["name"], size=font["size"], bold=True, color=header_color
+            ),
+            fill=_solid_fill(header_fill),
+            alignment=Alignment(horizontal="center", vertical="center"),
+            border=THIN_BORDER,
+        ),
+        "data_style": dict(
+            font=Font(**font),
+            alignment=Alignment(horizontal="left", vertical="center"),
+            border=THIN_BORDER,
+        ),
+    }
+
+
+def _named_style_attributes() -> Dict[str, dict]:
+    """
+    Return the named style attributes for the current settings.
+
+    The attributes are cached per settings values, so overridden settings
+    (e.g. in tests) still take effect.
+    """
+    return _build_named_style_attributes(
+        tuple(sorted(settings.EXCEL_FONT.items())),
+        settings.CURRENCY_FORMAT,
+        settings.COLORS["header_bold"],
+        settings.COLORS["header_yellow"],
+    )
+
+
+@lru_cache(maxsize=4096)
+def _group_indian(integer_part: str) -> str:
+    """
+    Insert Indian separators into a string of four or more digits.
+
+    Report columns repeat the same whole amounts over and over, so grouped
+    results are cached by their digits.
+    """
+    # Last 3 digits
+    last_three = integer_part[-3:]
+    remaining = integer_part[:-3]
+
+    # Group remaining digits in pairs from right to left
+    groups = []
+    while remaining:
+        groups.append(remaining[-2:])
+        remaining = remaining[:-2]
+
+    groups.reverse()
+    return ','.join(groups) + ',' + last_three
+
+
 def format_indian_currency(value):
     """
     Format a number in Indian currency style with crore, lakh separators.
@@ -49,18 +150,7 @@ def format_indian_currency(value):
         if len(integer_part) <= 3:
             formatted = integer_part
         else:
-            # Last 3 digits
-            last_three = integer_part[-3:]
-            remaining = integer_part[:-3]
-
-            # Group remaining digits in pairs from right to left
-            groups = []
-            while remaining:
-                groups.append(remaining[-2:])
-                remaining = remaining[:-2]
-
-            groups.reverse()
-            formatted = ','.join(groups) + ',' + last_three
+            formatted = _group_indian(integer_part)
 
         result = f"₹ {formatted}.{decimal_part}"
 
@@ -72,22 +162,152 @@ def format_indian_currency(value):
         return str(value)
 
 
+def _shift_rows(chars: np.ndarray, shift: np.ndarray) -> np.ndarray:
+    """Shift each row of a code point matrix right by ``shift`` (left if negative)."""
+    width = chars.shape[1]
+    source = np.arange(width) - shift[:, None]
+    shifted = np.take_along_axis(chars, np.clip(source, 0, width - 1), axis=1)
+    shifted[(source < 0) | (source >= width)] = 0
+    return shifted
+
+
+def _format_indian_amounts(amounts: np.ndarray) -> List[str]:
+    """Format finite numbers as Indian currency strings, as format_indian_currency does."""
+    # "%.2f" is the only per-value step; everything after works on the text
+    # as a (values x width) matrix of code points, padded with NUL
+    fixed = np.char.mod("%.2f", np.abs(amounts))
+    width = fixed.dtype.itemsize // 4
+    chars = fixed.view(np.uint32).reshape(len(fixed), width)
+
+    # Column layout of the right-aligned result: three spare columns for the
+    # "-₹ " prefix, the integer digits with a separator before the last three
+    # digits and every two digits after that, then ".dd"
+    integer_width = width - 3
+    layout = [-1, -1, -1]
+    separators = []
+    for position in range(integer_width):
+        layout.append(position)
+        digits_after = integer_width - 1 - position
+        if digits_after >= 3 and digits_after % 2 == 1:
+            separators.append(len(layout))
+            layout.append(-1)
+    layout.extend(range(integer_width, width))
+    layout = np.array(layout)
+    separators = np.array(separators, dtype=int)
+
+    # A single gather right-aligns every number into that layout
+    source = layout - (width - np.count_nonzero(chars, axis=1))[:, None]
+    grouped = np.take_along_axis(chars, np.clip(source, 0, width - 1), axis=1)
+    grouped[(layout < 0) | (source < 0)] = 0
+    grouped[:, separators] = np.where(grouped[:, separators - 1] != 0, ord(","), 0)
+
+    # Write the prefix just left of each number, then left-align the text
+    rows = np.arange(len(grouped))
+    first = grouped.shape[1] - np.count_nonzero(grouped, axis=1)
+    grouped[rows, first - 1] = ord(" ")
+    grouped[rows, first - 2] = ord("₹")
+    negative = amounts < 0
+    grouped[rows[negative], first[negative] - 3] = ord("-")
+    grouped = _shift_rows(grouped, -(first - 2 - negative))
+
+    text = grouped.view(f"<U{grouped.shape[1]}")
+    return text.reshape(len(text)).tolist()
+
+
+def format_indian_currency_series(values: pd.Series) -> pd.Series:
+    """
+    Vectorised ``format_indian_currency`` for a whole column.
+
+    Finite numbers are formatted with NumPy string operations in one pass;
+    any other value (text, infinities) goes through the scalar function.
+
+    Args:
+        values: Series of numbers (or numeric strings) to format
+
+    Returns:
+        pd.Series: Formatted currency strings with the same index
+    """
+    result = pd.Series("", index=values.index, dtype=object)
+
+    is_blank = values.isna() | (values == "")
+    numbers = pd.to_numeric(values, errors="coerce").astype(float)
+    is_number = np.isfinite(numbers) & ~is_blank
+
+    if is_number.any():
+        # Report columns repeat many amounts (zeros especially), so each
+        # distinct amount is formatted once and mapped back
+        amounts, positions = np.unique(numbers[is_number].to_numpy(), return_inverse=True)
+        formatted = np.array(_format_indian_amounts(amounts), dtype=object)
+        result[is_number] = formatted[positions]
+
+    is_other = ~(is_number | is_blank)
+    if is_other.any():
+        result[is_other] = values[is_other].map(format_indian_currency)
+
+    return result
+
+
+@dataclass(frozen=True)
+class ReportSchema:
+    """
+    Layout of a report sheet whose shape is known up front.
+
+    ``num_columns`` saves the formatter from deriving the column count from
+    the sheet, which scans every cell each time; leave it as None to derive
+    it. The other fields are the layout ``apply_all_formatting`` uses.
+    """
+
+    num_columns: Optional[int] = None
+    header_rows: Tuple[int, ...] = (1, 2)
+    currency_start_col: int = 4
+    data_start_row: int = 3
+    freeze_cell: Optional[str] = None  # None uses settings.FREEZE_PANES["default"]
+    summary_search_col: int = 4
+
+
 class BaseExcelFormatter(ABC):
     """Abstract base class for Excel formatting operations."""
 
-    def __init__(self, output_file: str, module_name: str = "ExcelFormatter"):
+    # Loggers by name, shared by all formatter instances so that creating a
+    # formatter does not go through the logging manager's lock
+    _loggers: Dict[str, logging.Logger] = {}
+
+    def __init__(
+        self,
+        output_file: str,
+        module_name: str = "ExcelFormatter",
+        workbook: Optional[openpyxl.Workbook] = None,
+        schema: Optional[ReportSchema] = None,
+    ):
+        """
+        Args:
+            output_file: Path the formatted workbook is saved to
+            module_name: Logger name
+            workbook: Workbook already built in memory (e.g. ``writer.book``
+                of a pandas ExcelWriter); when given, ``output_file`` is not
+                re-opened from disk
+            schema: Known layout of the report (default layout if omitted)
+        """
         self.output_file = output_file
-        self.logger = logging.getLogger(module_name)
+        self.schema = schema or ReportSchema()
+        self.logger = self._loggers.get(module_name)
+        if self.logger is None:
+            self.logger = self._loggers[module_name] = logging.getLogger(module_name)
 
-        self._workbook: Optional[openpyxl.Workbook] = None
+        self._workbook: Optional[openpyxl.Workbook] = workbook
         self._worksheet: Optional[openpyxl.Worksheet] = None
         self._styles_registered = False
 
+        if workbook is not None:
+            self._register_styles()
+
     @property
     def workbook(self) -> openpyxl.Workbook:
         """Lazy loading of workbook."""
         if self._workbook is None:
-            self._workbook = openpyxl.load_workbook(self.output_file)
+            # Formatting edits the cells, so the workbook cannot be opened
+            # read-only; external links are never needed though
+            self._workbook = openpyxl.load_workbook(self.output_file, keep_links=False)
             self._register_styles()
         return self._workbook
 
@@ -104,57 +324,18 @@ class BaseExcelFormatter(ABC):
         if self._styles_registered:
             return
 
-        # Currency style
-        if "currency_style" not in self.workbook.named_styles:
-            currency_style = NamedStyle(
-                name="currency_style",
-                font=Font(**settings.EXCEL_FONT),
-                number_format=settings.CURRENCY_FORMAT,
-                alignment=Alignment(horizontal="right"),
-            )
-            self.workbook.add_named_style(currency_style)
-
-        # Header style
-        if "header_style" not in self.workbook.named_styles:
-            header_style = NamedStyle(
-                name="header_style",
-                font=Font(
-                    name=settings.EXCEL_FONT["name"],
-                    size=settings.EXCEL_FONT["size"],
-                    bold=True,
-                    color=settings.COLORS["header_bold"],
-                ),
-                fill=PatternFill(
-                    start_color=settings.COLORS["header_yellow"],
-                    end_color=settings.COLORS["header_yellow"],
-                    fill_type="solid",
-                ),
-                alignment=Alignment(horizontal="center", vertical="center"),
-                border=self._create_border(),
-            )
-            self.workbook.add_named_style(header_style)
-
-        # Data style
-        if "data_style" not in self.workbook.named_styles:
-            data_style = NamedStyle(
-                name="data_style",
-                font=Font(**settings.EXCEL_FONT),
-                alignment=Alignment(horizontal="left", vertical="center"),
-                border=self._create_border(),
-            )
-            self.workbook.add_named_style(data_style)
+        # Styles are bound to the workbook they are added to, so each workbook
+        # gets its own NamedStyle built from the shared attributes
+        for name, attributes in _named_style_attributes().items():
+            if name not in self.workbook.named_styles:
+                self.workbook.add_named_style(NamedStyle(name=name, **attributes))
 
         self._styles_registered = True
         self.logger.info("Excel styles registered successfully")
 
     def _create_border(self) -> Border:
-        """Create standardized border style."""
-        return Border(
-            left=Side(style="thin", color="000000"),
-            right=Side(style="thin", color="000000"),
-            top=Side(style="thin", color="000000"),
-            bottom=Side(style="thin", color="000000"),
-        )
+        """Return the standardized border style."""
+        return THIN_BORDER
 
     @handle_error
     def apply_freeze_panes(self, freeze_cell: str = None):
@@ -163,7 +344,7 @@ class BaseExcelFormatter(ABC):
             freeze_cell = settings.FREEZE_PANES["default"]
 
         self.worksheet.freeze_panes = freeze_cell
-        self.logger.info(f"Freeze panes applied at {freeze_cell}")
+        self.logger.info("Freeze panes applied at %s", freeze_cell)
 
     @handle_error
     def apply_font_style(self, cell_range: str = None):
@@ -174,86 +355,147 @@ class BaseExcelFormatter(ABC):
             for row in self.worksheet[cell_range]:
                 for cell in row:
                     cell.font = font
+        elif len(self.workbook.worksheets) == 1:
+            # Cells without a font of their own use the workbook's first font,
+            # so replacing it styles the whole sheet at once; only cells that
+            # carry a style of their own still need to be assigned one by one
+            set_default_font(self.workbook, font)
+            for row in self.worksheet.iter_rows(max_col=self._column_count()):
+                for cell in row:
+                    if cell.has_style:
+                        cell.font = font
         else:
-            for row in self.worksheet.iter_rows():
+            for row in self.worksheet.iter_rows(max_col=self._column_count()):
                 for cell in row:
                     cell.font = font
 
-        self.logger.info(f"Font styling applied to {cell_range or 'entire sheet'}")
+        self.logger.info("Font styling applied to %s", cell_range or "entire sheet")
+
+    @classmethod
+    def _write_only(
+        cls,
+        output_file: str,
+        sheet_name: str,
+        module_name: str,
+        schema: Optional[ReportSchema] = None,
+    ) -> "BaseExcelFormatter":
+        """Create a formatter on a new write-only workbook with one sheet."""
+        formatter = cls(
+            output_file,
+            module_name=module_name,
+            workbook=openpyxl.Workbook(write_only=True),
+            schema=schema,
+        )
+        set_default_font(formatter.workbook, Font(**settings.EXCEL_FONT))
+        formatter._worksheet = formatter.workbook.create_sheet(sheet_name)
+        return formatter
+
+    @staticmethod
+    def _column_widths(
+        df: pd.DataFrame, headers: List[str], min_width: int = 10, max_width: int = 50
+    ) -> List[int]:
+        """Column widths as ``auto_adjust_column_widths`` would set them."""
+        widths = []
+        for header, (_, values) in zip(headers, df.items()):
+            values = values[values.notna() & values.astype(bool)]
+            lengths = [len(header)] if header else []
+            if not values.empty:
+                text = values.astype(str)
+                if values.dtype.kind == "f":
+                    # Whole floats are stored in the sheet without ".0"
+                    whole = values % 1 == 0
+                    text[whole] = values[whole].astype("int64").astype(str)
+                lengths.append(text.str.len().max())
+
+            max_length = max(lengths, default=min_width)
+            widths.append(min(max(max_length + 2, min_width), max_width))
+        return widths
+
+    def _set_column_widths(self, df: pd.DataFrame, headers: List[str]):
+        """Size the columns of a write-only sheet before rows are appended."""
+        for col, width in enumerate(self._column_widths(df, headers), start=1):
+            self.worksheet.column_dimensions[get_column_letter(col)].width = width
+
+    def _column_count(self) -> int:
+        """Number of report columns, taken from the schema when it is known."""
+        if self.schema.num_columns is not None:
+            return self.schema.num_columns
+        return self.worksheet.max_column
 
     @handle_error
-    def apply_currency_formatting(self, start_col: int = 4, end_col: int = None):
-        """Apply currency formatting to specified columns."""
+    def apply_currency_formatting(
+        self, start_col: int = 4, end_col: int = None, start_row: int = 3
+    ):
+        """Apply currency formatting to the data rows of specified columns."""
         if end_col is None:
-            end_col = self.worksheet.max_column
-
-        currency_style = self.workbook.named_styles["currency_style"]
+            end_col = self._column_count()
 
-        for col in range(start_col, end_col + 1):
-            col_letter = get_column_letter(col)
-            for cell in self.worksheet[col_letter]:
-                if isinstance(cell.value, (int, float)) and cell.value != 0:
-                    cell.style = currency_style
+        # Named styles are assigned by name; workbook.named_styles only
+        # lists the names. Header rows above start_row keep their style, and
+        # exact type checks leave booleans unformatted
+        for row in self.worksheet.iter_rows(
+            min_row=start_row, min_col=start_col, max_col=end_col
+        ):
+            for cell in row:
+                value = cell.value
+                if (type(value) is float or type(value) is int) and value:
+                    cell.style = "currency_style"
 
-        self.logger.info(f"Currency formatting applied to columns {start_col}-{end_col}")
+        self.logger.info("Currency formatting applied to columns %d-%d", start_col, end_col)
 
     @handle_error
     def auto_adjust_column_widths(self, min_width: int = 10, max_width: int = 50):
         """Auto-adjust column widths based on content."""
-        for col in range(1, self.worksheet.max_column + 1):
-            col_letter = get_column_letter(col)
-
-            # Calculate max length in column
-            max_length = max(
-                (
-                    len(str(cell.value))
-                    for cell in self.worksheet[col_letter]
-                    if cell.value
-                ),
-                default=min_width,
-            )
+        # Measure every column in one pass over the sheet; None marks a
+        # column without any non-empty value
+        column_count = self._column_count()
+        max_lengths = [None] * column_count
+
+        for row in self.worksheet.iter_rows(max_col=column_count, values_only=True):
+            for idx, value in enumerate(row):
+                if value:
+                    length = len(str(value))
+                    if max_lengths[idx] is None or length > max_lengths[idx]:
+                        max_lengths[idx] = length
+
+        for col, max_length in enumerate(max_lengths, start=1):
+            if max_length is None:
+                max_length = min_width
 
             # Apply width with constraints
             adjusted_width = min(max(max_length + 2, min_width), max_width)
-            self.worksheet.column_dimensions[col_letter].width = adjusted_width
+            self.worksheet.column_dimensions[get_column_letter(col)].width = adjusted_width
 
-        self.logger.info(f"Column widths auto-adjusted (min={min_width}, max={max_width})")
+        self.logger.info("Column widths auto-adjusted (min=%d, max=%d)", min_width, max_width)
 
     @handle_error
     def apply_alternating_row_colors(self, start_row: int = 3):
         """Apply alternating row colors for better readability."""
-        sky_blue_fill = PatternFill(
-            start_color=settings.COLORS["row_sky_blue"],
-            end_color=settings.COLORS["row_sky_blue"],
-            fill_type="solid",
-        )
-        white_fill = PatternFill(
-            start_color=settings.COLORS["row_white"],
-            end_color=settings.COLORS["row_white"],
-            fill_type="solid",
-        )
+        sky_blue_fill = _solid_fill(settings.COLORS["row_sky_blue"])
+        white_fill = _solid_fill(settings.COLORS["row_white"])
+        border = self._create_border()
 
-        for row_num in range(start_row, self.worksheet.max_row + 1):
-            fill = sky_blue_fill if row_num % 2 == 0 else white_fill
+        for row in self.worksheet.iter_rows(
+            min_row=start_row, max_col=self._column_count()
+        ):
+            fill = sky_blue_fill if row[0].row % 2 == 0 else white_fill
 
-            for col in range(1, self.worksheet.max_column + 1):
-                cell = self.worksheet.cell(row=row_num, column=col)
+            for cell in row:
                 cell.fill = fill
-                cell.border = self._create_border()
+                cell.border = border
 
-        self.logger.info(f"Alternating row colors applied from row {start_row}")
+        self.logger.info("Alternating row colors applied from row %d", start_row)
 
     @handle_error
     def apply_header_formatting(self, header_rows: List[int] = [1, 2]):
         """Apply header formatting to specified rows."""
-        header_style = self.workbook.named_styles["header_style"]
+        max_column = self._column_count()
 
         for row_num in header_rows:
-            for col in range(1, self.worksheet.max_column + 1):
-                cell = self.worksheet.cell(row=row_num, column=col)
-                cell.style = header_style
+            for col in range(1, max_column + 1):
+                self.worksheet.cell(row=row_num, column=col).style = "header_style"
 
-        self.logger.info(f"Header formatting applied to rows {header_rows}")
+        self.logger.info("Header formatting applied to rows %s", header_rows)
 
     @handle_error
     def highlight_summary_rows(
@@ -266,22 +508,29 @@ class BaseExcelFormatter(ABC):
         if highlight_color is None:
             highlight_color = settings.COLORS["summary_light_green"]
 
-        highlight_fill = PatternFill(
-            start_color=highlight_color, end_color=highlight_color, fill_type="solid"
-        )
+        highlight_fill = _solid_fill(highlight_color)
 
-        highlighted_count = 0
-        search_col_letter = get_column_letter(search_column)
+        lookup = frozenset(values_to_highlight)
+        max_column = self._column_count()
 
-        for cell in self.worksheet[search_col_letter]:
-            if cell.value in values_to_highlight:
-                # Highlight entire row
-                for col in range(1, self.worksheet.max_column + 1):
-                    row_cell = self.worksheet.cell(row=cell.row, column=col)
-                    row_cell.fill = highlight_fill
-                highlighted_count += 1
+        # Read the search column as plain values and collect matching rows
+        search_values = next(
+            self.worksheet.iter_cols(
+                min_col=search_column, max_col=search_column, values_only=True
+            ),
+            (),
+        )
+        matching_rows = [
+            row for row, value in enumerate(search_values, start=1) if value in lookup
+        ]
+
+        for row in matching_rows:
+            # Highlight entire row
+            for col in range(1, max_column + 1):
+                self.worksheet.cell(row=row, column=col).fill = highlight_fill
+        highlighted_count = len(matching_rows)
 
-        self.logger.info(f"Highlighted {highlighted_count} summary rows")
+        self.logger.info("Highlighted %d summary rows", highlighted_count)
 
     @handle_error
     def create_data_table(
@@ -297,7 +546,15 @@ class BaseExcelFormatter(ABC):
         )
 
         table = Table(displayName=table_name, ref=data_range)
-        table.tableStyleInfo = TableStyleInfo(
+        table.tableStyleInfo = self._table_style_info(table_style)
+
+        self.worksheet.add_table(table)
+        self.logger.info("Data table '%s' created with style %s", table_name, table_style)
+
+    @staticmethod
+    def _table_style_info(table_style: str) -> TableStyleInfo:
+        """Create the row-striped table style used by report tables."""
+        return TableStyleInfo(
             name=table_style,
             showFirstColumn=False,
             showLastColumn=False,
@@ -305,14 +562,11 @@ class BaseExcelFormatter(ABC):
             showColumnStripes=False,
         )
 
-        self.worksheet.add_table(table)
-        self.logger.info(f"Data table '{table_name}' created with style {table_style}")
-
     @handle_error
     def save(self):
         """Save the formatted workbook."""
         self.workbook.save(self.output_file)
-        self.logger.info(f"Excel file saved: {self.output_file}")
+        self.logger.info("Excel file saved: %s", self.output_file)
 
     @abstractmethod
     def apply_all_formatting(self):
@@ -323,26 +577,113 @@ class BaseExcelFormatter(ABC):
 class StandardReportFormatter(BaseExcelFormatter):
     """Standard formatter for budget and variance reports."""
 
+    @classmethod
+    def from_dataframe(
+        cls,
+        df: pd.DataFrame,
+        output_file: str,
+        summary_wbs_list: List[str] = None,
+        sheet_name: str = "Sheet1",
+        schema: Optional[ReportSchema] = None,
+        module_name: str = "ExcelFormatter",
+    ) -> "StandardReportFormatter":
+        """
+        Build a standard report straight from a DataFrame in write-only mode.
+
+        The result is styled as if ``df`` had been written with ``to_excel``
+        and formatted with ``apply_all_formatting``, but each row is styled
+        as it is streamed, so memory stays flat however many rows there are.
+        Call ``save`` to write the file.
+
+        Args:
+            df: Report data with single-level columns
+            output_file: Path the report is saved to
+            summary_wbs_list: WBS elements whose rows are highlighted
+            sheet_name: Title of the report sheet
+            schema: Layout of the report (default layout if omitted)
+            module_name: Logger name
+        """
+        formatter = cls._write_only(output_file, sheet_name, module_name, schema)
+        formatter._stream_standard_rows(df, summary_wbs_list)
+        return formatter
+
+    def _stream_standard_rows(self, df: pd.DataFrame, summary_wbs_list: List[str]):
+        """Append the header and data rows with the standard report styling."""
+        worksheet = self.worksheet
+        schema = self.schema
+        headers = [str(col) for col in df.columns]
+
+        # Sheet settings have to be in place before the first row is appended
+        worksheet.freeze_panes = schema.freeze_cell or settings.FREEZE_PANES["default"]
+        self._set_column_widths(df, headers)
+
+        header_rows = frozenset(schema.header_rows)
+        summary_wbs = frozenset(summary_wbs_list or ())
+        search_pos = schema.summary_search_col - 1
+        currency_pos = schema.currency_start_col - 1
+        even_fill = _solid_fill(settings.COLORS["row_sky_blue"])
+        odd_fill = _solid_fill(settings.COLORS["row_white"])
+        highlight_fill = _solid_fill(settings.COLORS["summary_light_green"])
+
+        rows = chain([headers], df.itertuples(index=False, name=None))
+        for row_num, row in enumerate(rows, start=1):
+            values = [None if pd.isna(value) else value for value in row]
+            is_header = row_num in header_rows
+            is_data = row_num >= schema.data_start_row
+            # Summary membership is known before the row is written, so the
+            # highlight is applied in the same pass
+            highlight = search_pos < len(values) and values[search_pos] in summary_wbs
+
+            if not (is_header or is_data or highlight):
+                worksheet.append(values)
+                continue
+
+            # Same precedence as apply_all_formatting: header style, then
+            # currency style, alternating fill and border, then highlight
+            fill = even_fill if row_num % 2 == 0 else odd_fill
+            cells = []
+            for pos, value in enumerate(values):
+                cell = WriteOnlyCell(worksheet, value=value)
+                if is_header:
+                    cell.style = "header_style"
+                if is_data:
+                    if pos >= currency_pos and (type(value) is float or type(value) is int) and value:
+                        cell.style = "currency_style"
+                    cell.fill = fill
+                    cell.border = THIN_BORDER
+                if highlight:
+                    cell.fill = highlight_fill
+                cells.append(cell)
+            worksheet.append(cells)
+
+        self.logger.info("Streamed %d rows into '%s'", len(df), worksheet.title)
+
     def apply_all_formatting(self, summary_wbs_list: List[str] = None):
         """Apply comprehensive formatting for standard reports."""
         try:
             self.logger.info("Applying standard report formatting")
 
+            schema = self.schema
+
             # Step 1: Basic formatting
-            self.apply_freeze_panes()
+            self.apply_freeze_panes(schema.freeze_cell)
             self.apply_font_style()
             self.auto_adjust_column_widths()
 
             # Step 2: Header formatting
-            self.apply_header_formatting()
+            self.apply_header_formatting(list(schema.header_rows))
 
             # Step 3: Data formatting
-            self.apply_currency_formatting()
-            self.apply_alternating_row_colors()
+            self.apply_currency_formatting(
+                schema.currency_start_col, start_row=schema.data_start_row
+            )
+            self.apply_alternating_row_colors(schema.data_start_row)
 
             # Step 4: Conditional highlighting
             if summary_wbs_list:
-                self.highlight_summary_rows(summary_wbs_list)
+                self.highlight_summary_rows(
+                    summary_wbs_list, schema.summary_search_col
+                )
 
             self.logger.info("Standard report formatting completed successfully")
 
@@ -355,6 +696,107 @@ class StandardReportFormatter(BaseExcelFormatter):
 class AnalyticsReportFormatter(BaseExcelFormatter):
     """Enhanced formatter for analytics reports with charts."""
 
+    @classmethod
+    def from_dataframe(
+        cls,
+        df: pd.DataFrame,
+        output_file: str,
+        sheet_name: str = "Sheet1",
+        table_name: str = "AnalyticsTable",
+        table_style: str = "TableStyleMedium2",
+        freeze_cell: str = "D3",
+        currency_start_col: int = 4,
+        module_name: str = "ExcelFormatter",
+    ) -> "AnalyticsReportFormatter":
+        """
+        Build an analytics report straight from a DataFrame in write-only mode.
+
+        Rows are styled while they are streamed into the sheet, so the
+        report is never written, re-loaded and formatted, and memory stays
+        flat however large it is. Charts can still be added with
+        ``create_3d_chart`` before ``save``; methods that revisit cells
+        (``apply_font_style``, ``create_data_table``, ...) do not work on a
+        write-only sheet.
+
+        Args:
+            df: Report data with single-level columns
+            output_file: Path the report is saved to
+            sheet_name: Title of the report sheet
+            table_name: Display name of the data table
+            table_style: Excel table style
+            freeze_cell: Cell to freeze panes at
+            currency_start_col: First column (1-indexed) given the currency
+                style, as in ``apply_currency_formatting``
+            module_name: Logger name
+        """
+        formatter = cls._write_only(output_file, sheet_name, module_name)
+        formatter._stream_dataframe(df, freeze_cell, currency_start_col)
+        formatter._add_streamed_table(df, table_name, table_style)
+        return formatter
+
+    def _stream_dataframe(
+        self, df: pd.DataFrame, freeze_cell: str, currency_start_col: int
+    ):
+        """Append the header and data rows of ``df`` with their styles."""
+        worksheet = self.worksheet
+        headers = [str(col) for col in df.columns]
+
+        # Sheet settings have to be in place before the first row is appended
+        worksheet.freeze_panes = freeze_cell
+        self._set_column_widths(df, headers)
+
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(worksheet, value=header)
+            cell.style = "header_style"
+            header_cells.append(cell)
+        worksheet.append(header_cells)
+
+        for row in df.itertuples(index=False, name=None):
+            cells = []
+            for col, value in enumerate(row, start=1):
+                if pd.isna(value):
+                    value = None
+                elif (
+                    col >= currency_start_col
+                    and isinstance(value, (int, float))
+                    and value != 0
+                ):
+                    value = WriteOnlyCell(worksheet, value=value)
+                    value.style = "currency_style"
+                cells.append(value)
+            worksheet.append(cells)
+
+        self.logger.info("Streamed %d rows into '%s'", len(df), worksheet.title)
+
+    def _add_streamed_table(self, df: pd.DataFrame, table_name: str, table_style: str):
+        """Add the data table over the streamed rows."""
+        if df.empty:
+            self.logger.warning("Insufficient data for table creation")
+            return
+
+        data_range = f"A1:{get_column_letter(len(df.columns))}{len(df) + 1}"
+
+        # Write-only sheets cannot be read back, so the table columns are
+        # named from the DataFrame headers
+        table = Table(
+            displayName=table_name,
+            ref=data_range,
+            autoFilter=AutoFilter(ref=data_range),
+            tableColumns=[
+                TableColumn(id=idx, name=str(header))
+                for idx, header in enumerate(df.columns, start=1)
+            ],
+        )
+        table.tableStyleInfo = self._table_style_info(table_style)
+
+        with warnings.catch_warnings():
+            # openpyxl warns on every write-only table, even when the
+            # columns have been supplied as above
+            warnings.simplefilter("ignore", UserWarning)
+            self.worksheet.add_table(table)
+        self.logger.info("Data table '%s' created with style %s", table_name, table_style)
+
     @handle_error
     def add_data_validation(
         self,
@@ -371,7 +813,7 @@ class AnalyticsReportFormatter(BaseExcelFormatter):
         self.worksheet.add_data_validation(dv)
         dv.add(self.worksheet[cell_range])
 
-        self.logger.info(f"Data validation added to {cell_range}")
+        self.logger.info("Data validation added to %s", cell_range)
 
     @handle_error
     def create_3d_chart(
@@ -400,7 +842,7 @@ class AnalyticsReportFormatter(BaseExcelFormatter):
         chart.height = 10
 
         self.worksheet.add_chart(chart, chart_position)
-        self.logger.info(f"3D chart '{chart_title}' created at {chart_position}")
+        self.logger.info("3D chart '%s' created at %s", chart_title, chart_position)
 
     def apply_all_formatting(self, enable_charts: bool = True):
         """Apply comprehensive formatting for analytics reports."""
@@ -11,32 +11,26 @@ KEY FEATURES:
 - Company and project type mapping
 - Statistical summary with multiple dimensions
 """
+import json
 import os
 import re
+from collections import Counter
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import openpyxl
-from openpyxl.styles import PatternFill, Font
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, PatternFill, Font, Side
 from openpyxl.worksheet.datavalidation import DataValidation
 from openpyxl.chart import BarChart3D, Reference
-from openpyxl.chart.series import DataPoint
 
 from django.conf import settings
 from .data_processing import BaseDataProcessor
 from .error_handling import handle_error
 
 
-def generate_formatted_html_with_charts(crosstab_df):
-    """
-    Generate a professionally formatted HTML dashboard with interactive charts.
-    Uses Chart.js for web-based visualization.
-    Returns a dictionary with separate HTML and JavaScript components.
-    """
-    html_parts = []
-    script_parts = []
-
-    # Add CSS only (Chart.js will be loaded separately in template)
-    html_parts.append('''
+# Static parts of the dashboard, shared by every render
+_GLIMPS_CSS = '''
     <style>
         .glimps-container {
             font-family: 'Bookman Old Style', 'Times New Roman', serif;
@@ -84,87 +78,27 @@ def generate_formatted_html_with_charts(crosstab_df):
             background-color: white;
         }
     </style>
-    ''')
-
-    html_parts.append('<div class="glimps-container">')
-
-    # Extract column colors
-    column_colors = {
-        "NIGEL": "#A6CE39",
-        "NIRL": "#E15B64",
-        "NLCIL": "#9B6ED2",
-        "NTPL": "#68C3A3",
-        "NUPPL": "#C69C6D",
-        "Total": "#D1D3D4"
-    }
-
-    # Cross-tab table with colors
-    html_parts.append('<h2>Project Cross-Tabulation Analysis</h2>')
-    html_parts.append('<table class="crosstab-table">')
-
-    # Header row
-    html_parts.append('<thead><tr>')
-    html_parts.append('<th style="background-color: #B0C4DE;">Project Type</th>')
-
-    for col in crosstab_df.columns:
-        color = column_colors.get(col, "#EAEAEA")
-        header_color_light = {
-            "NIGEL": "#EAF1DD",
-            "NIRL": "#FDEDEC",
-            "NLCIL": "#EDE3F1",
-            "NTPL": "#E0F2F1",
-            "NUPPL": "#F3E5D8",
-            "Total": "#EAEAEA"
-        }.get(col, "#EAEAEA")
-
-        html_parts.append(f'<th style="background-color: {header_color_light};">{col}</th>')
-
-    html_parts.append('</tr></thead>')
-
-    # Data rows
-    html_parts.append('<tbody>')
-    for idx, row in crosstab_df.iterrows():
-        html_parts.append('<tr>')
-        html_parts.append(f'<td style="background-color: #DCE6F1;"><strong>{idx}</strong></td>')
-
-        for col_idx, (col, value) in enumerate(row.items()):
-            color = column_colors.get(col, "#EAEAEA")
-            html_parts.append(f'<td style="background-color: {color};">{value}</td>')
-
-        html_parts.append('</tr>')
-    html_parts.append('</tbody>')
-
-    html_parts.append('</table>')
-
-    # Company selector
-    html_parts.append('<div class="company-selector">')
-    html_parts.append('<label for="companySelect">Select Company:</label>')
-    html_parts.append('<select id="companySelect" onchange="updateChart()">')
-
-    for col in crosstab_df.columns:
-        if col != 'Total':
-            html_parts.append(f'<option value="{col}">{col}</option>')
-
-    html_parts.append('</select>')
-    html_parts.append('</div>')
-
-    # Chart container
-    html_parts.append('<div class="chart-container">')
-    html_parts.append('<canvas id="projectChart" width="800" height="400"></canvas>')
-    html_parts.append('</div>')
-
-    html_parts.append('</div>')
-
-    # Prepare data for JavaScript
-    project_types = [str(idx) for idx in crosstab_df.index if idx != 'Total']
-    chart_data = {}
-
-    for col in crosstab_df.columns:
-        if col != 'Total':
-            chart_data[col] = [int(crosstab_df.loc[pt, col]) if pt in crosstab_df.index else 0 for pt in project_types]
-
-    # JavaScript for interactive chart (to be loaded separately)
-    script_parts.append(f'''
+    '''
+
+# (header, cell) background colours of each company column, in sheet column
+# order, shared by the HTML dashboard and the Excel sheet
+COMPANY_PALETTE = {
+    "NIGEL": ("EAF1DD", "A6CE39"),
+    "NIRL": ("FDEDEC", "E15B64"),
+    "NLCIL": ("EDE3F1", "9B6ED2"),
+    "NTPL": ("E0F2F1", "68C3A3"),
+    "NUPPL": ("F3E5D8", "C69C6D"),
+    "Total": ("EAEAEA", "D1D3D4"),
+}
+
+# (header, cell) colours of the Project Type column in the Excel sheet
+PROJECT_TYPE_PALETTE = ("DCE6F1", "B0C4DE")
+
+_HEADER_COLORS = {company: f"#{header}" for company, (header, _) in COMPANY_PALETTE.items()}
+_COLUMN_COLORS = {company: f"#{cell}" for company, (_, cell) in COMPANY_PALETTE.items()}
+
+# Filled in with str.format, hence the doubled braces
+_CHART_SCRIPT_TEMPLATE = '''
     const projectTypes = {project_types};
     const chartData = {chart_data};
     const colors = ["#00FF00", "#FF0000", "#0000FF", "#FFFF00", "#FF00FF", "#00FFFF"];
@@ -236,7 +170,91 @@ def generate_formatted_html_with_charts(crosstab_df):
     document.addEventListener('DOMContentLoaded', function() {{
         updateChart();
     }});
-    ''')
+    '''
+
+
+def generate_formatted_html_with_charts(crosstab_df):
+    """
+    Generate a professionally formatted HTML dashboard with interactive charts.
+    Uses Chart.js for web-based visualization.
+    Returns a dictionary with separate HTML and JavaScript components.
+    """
+    html_parts = []
+    script_parts = []
+
+    # Add CSS only (Chart.js will be loaded separately in template)
+    html_parts.append(_GLIMPS_CSS)
+
+    html_parts.append('<div class="glimps-container">')
+
+    # Cross-tab table with colors
+    html_parts.append('<h2>Project Cross-Tabulation Analysis</h2>')
+    html_parts.append('<table class="crosstab-table">')
+
+    # Header row
+    html_parts.append('<thead><tr>')
+    html_parts.append('<th style="background-color: #B0C4DE;">Project Type</th>')
+
+    html_parts.extend(
+        f'<th style="background-color: {_HEADER_COLORS.get(col, "#EAEAEA")};">{col}</th>'
+        for col in crosstab_df.columns
+    )
+
+    html_parts.append('</tr></thead>')
+
+    # Data rows: look up each column's color once, then render a row per string
+    cell_openings = [
+        f'<td style="background-color: {_COLUMN_COLORS.get(col, "#EAEAEA")};">'
+        for col in crosstab_df.columns
+    ]
+    html_parts.append('<tbody>')
+    html_parts.extend(
+        f'<tr><td style="background-color: #DCE6F1;"><strong>{idx}</strong></td>'
+        + ''.join(
+            f'{opening}{value}</td>' for opening, value in zip(cell_openings, row)
+        )
+        + '</tr>'
+        for idx, row in zip(crosstab_df.index, crosstab_df.itertuples(index=False, name=None))
+    )
+    html_parts.append('</tbody>')
+
+    html_parts.append('</table>')
+
+    # Company selector
+    html_parts.append('<div class="company-selector">')
+    html_parts.append('<label for="companySelect">Select Company:</label>')
+    html_parts.append('<select id="companySelect" onchange="updateChart()">')
+
+    for col in crosstab_df.columns:
+        if col != 'Total':
+            html_parts.append(f'<option value="{col}">{col}</option>')
+
+    html_parts.append('</select>')
+    html_parts.append('</div>')
+
+    # Chart container
+    html_parts.append('<div class="chart-container">')
+    html_parts.append('<canvas id="projectChart" width="800" height="400"></canvas>')
+    html_parts.append('</div>')
+
+    html_parts.append('</div>')
+
+    # Prepare data for JavaScript: one column slice per company instead of
+    # a .loc lookup per cell. Labels missing from the index chart as 0.
+    project_types = [str(idx) for idx in crosstab_df.index if idx != 'Total']
+    chart_df = crosstab_df.drop(columns='Total', errors='ignore').reindex(
+        project_types, fill_value=0
+    )
+    chart_data = {
+        col: chart_df[col].astype(int).tolist() for col in chart_df.columns
+    }
+
+    # JavaScript for interactive chart (to be loaded separately); the data is
+    # embedded as JSON rather than Python reprs
+    script_parts.append(_CHART_SCRIPT_TEMPLATE.format(
+        project_types=json.dumps(project_types, separators=(",", ":")),
+        chart_data=json.dumps(chart_data, separators=(",", ":")),
+    ))
 
     return {
         'html': ''.join(html_parts),
@@ -244,13 +262,62 @@ def generate_formatted_html_with_charts(crosstab_df):
     }
 
 
+# Captures project IDs such as 'PRJ AB-C123'
+_PROJECT_ID_PATTERN = re.compile(settings.REGEX_PATTERNS["project_id"])
+
+# Lines without the literal "PRJ" that starts the default pattern cannot
+# match, and a substring test rejects them faster than search; a configured
+# pattern that does not start with it is searched on every line
+_PROJECT_ID_MARKER = "PRJ" if _PROJECT_ID_PATTERN.pattern.startswith("PRJ") else ""
+
+
+def _iter_project_ids(lines):
+    """Yield the first project ID found on each line that has one."""
+    search = _PROJECT_ID_PATTERN.search
+    for line in lines:
+        if _PROJECT_ID_MARKER not in line:
+            continue
+        match = search(line)
+        if match:
+            yield match.group(1)
+
+
+def _crosstab_from_counts(counts: Counter) -> pd.DataFrame:
+    """
+    Build the project type by company table from (type, company) counts.
+
+    The result matches pd.crosstab(..., margins=True, margins_name="Total")
+    over the same pairs, without materialising a DataFrame of every project.
+    """
+    project_types = sorted({project_type for project_type, _ in counts})
+    companies = sorted({company for _, company in counts})
+    type_rows = {project_type: row for row, project_type in enumerate(project_types)}
+    company_cols = {company: col for col, company in enumerate(companies)}
+
+    # The last row and column hold the totals
+    table = np.zeros((len(project_types) + 1, len(companies) + 1), dtype=np.int64)
+    for (project_type, company), count in counts.items():
+        table[type_rows[project_type], company_cols[company]] = count
+    table[:-1, -1] = table[:-1, :-1].sum(axis=1)
+    table[-1] = table[:-1].sum(axis=0)
+
+    return pd.DataFrame(
+        table,
+        index=pd.Index([*project_types, "Total"], name="Project Type"),
+        columns=pd.Index([*companies, "Total"], name="Company"),
+    )
+
+
 class GlimpsOfProjectsProcessor(BaseDataProcessor):
     """Handles all data processing operations for the Glimps of Projects Report."""
 
-    def __init__(self, input_file_path: str):
+    def __init__(self, input_file_path: str, keep_project_data: bool = False):
         super().__init__('GlimpsOfProjects')
         self.input_file_path = Path(input_file_path)
-        self.project_data = []
+        # The per-project rows are only kept on request; the report itself
+        # needs just the counts
+        self.keep_project_data = keep_project_data
+        self.project_data = pd.DataFrame()
 
     def validate_input(self, file_path: str) -> bool:
         """Validate the input DAT file format and content."""
@@ -273,49 +340,45 @@ class GlimpsOfProjectsProcessor(BaseDataProcessor):
         Extracts project data from DAT file using regex patterns.
         Returns crosstab DataFrame for analysis.
         """
-        project_id_pattern = settings.REGEX_PATTERNS["project_id"]  # r"PRJ\s+([A-Z0-9-]+)"
-        company_codes = settings.COMPANY_CODES
-        project_types = settings.PROJECT_TYPES
-
-        self.project_data = []
-
         with open(file_path, "r", encoding="utf-8", errors="ignore") as file:
-            for line in file:
-                match = re.search(project_id_pattern, line)
-                if match:
-                    project_id = match.group(1)
-
-                    # Extract company code (first 2 characters)
-                    company_code = project_id[:2]
-                    company_desc = company_codes.get(company_code, "Unknown Company")
-
-                    # Extract project type (4th character, index 3)
-                    if len(project_id) > 3:
-                        project_type_code = project_id[3]
-                        project_desc = project_types.get(project_type_code, "Unknown Project Type")
-                    else:
-                        project_desc = "Unknown Project Type"
-
-                    self.project_data.append(
-                        {
-                            "Project Type": project_desc,
-                            "Company": company_desc,
-                            "Project ID": project_id,
-                        }
-                    )
+            project_id_column = list(_iter_project_ids(file))
+
+        # Bound lookups, called once per project ID
+        company_code_get = settings.COMPANY_CODES.get
+        project_type_get = settings.PROJECT_TYPES.get
+
+        # Company code is the first 2 characters of the ID
+        company_column = [
+            company_code_get(project_id[:2], "Unknown Company")
+            for project_id in project_id_column
+        ]
+
+        # Project type is the 4th character (index 3)
+        project_type_column = [
+            project_type_get(project_id[3], "Unknown Project Type")
+            if len(project_id) > 3 else "Unknown Project Type"
+            for project_id in project_id_column
+        ]
+
+        if not project_id_column:
+            raise ValueError("No project data found in the DAT file")
 
-        # Generate cross-tabulation
-        if self.project_data:
-            df = pd.DataFrame(self.project_data)
-            crosstab = pd.crosstab(
-                df["Project Type"],
-                df["Company"],
-                margins=True,
-                margins_name="Total"
+        if self.keep_project_data:
+            self.project_data = pd.DataFrame(
+                {
+                    "Project Type": project_type_column,
+                    "Company": company_column,
+                    "Project ID": project_id_column,
+                }
             )
-            return crosstab
-        else:
-            raise ValueError("No project data found in the DAT file")
+
+        # Generate cross-tabulation
+        return _crosstab_from_counts(
+            Counter(zip(project_type_column, company_column))
+        )
+
+
+HEADER_FONT = Font(bold=True, color="000000")
 
 
 class GlimpsExcelFormatter:
@@ -326,41 +389,78 @@ class GlimpsExcelFormatter:
         self.output_file = output_file
         self.workbook = None
         self.worksheet = None
+        self._cells = {}
 
     @handle_error
     def format_and_save(self):
         """Format and save the Excel file with charts and data validation."""
-        # Write crosstab to Excel
-        self.crosstab_df.to_excel(self.output_file)
+        # Build the styled cells first and stream them into a write-only
+        # workbook, so the file is saved once instead of being written by
+        # pandas, reloaded for styling and saved again
+        self.workbook = openpyxl.Workbook(write_only=True)
+        self.worksheet = self.workbook.create_sheet("Sheet1")
+        self._cells = {}
 
-        # Load workbook for advanced formatting
-        self.workbook = openpyxl.load_workbook(self.output_file)
-        self.worksheet = self.workbook.active
+        self._write_crosstab()
 
         # Apply styling
         self._apply_column_colors()
         self._add_data_validation()
         self._add_dynamic_reference_section()
+        self._append_rows()
         self._add_chart()
 
         self.workbook.save(self.output_file)
         return self.output_file
 
+    def _cell(self, row: int, column: int) -> WriteOnlyCell:
+        """Returns the pending cell at a position, creating it on first use."""
+        cell = self._cells.get((row, column))
+        if cell is None:
+            cell = self._cells[row, column] = WriteOnlyCell(self.worksheet)
+        return cell
+
+    def _write_crosstab(self):
+        """Writes the crosstab with the header styling pandas' to_excel uses."""
+        thin = Side(style="thin")
+        header_border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        header_font = Font(bold=True)
+        header_alignment = Alignment(horizontal="center", vertical="top")
+
+        header = [self.crosstab_df.index.name, *self.crosstab_df.columns]
+        for col, value in enumerate(header, start=1):
+            self._cell(1, col).value = value
+
+        rows = self.crosstab_df.itertuples(name=None)
+        for row, values in enumerate(rows, start=2):
+            for col, value in enumerate(values, start=1):
+                self._cell(row, col).value = value
+
+        # Header row and index column cells
+        for row, col in self._cells:
+            if row == 1 or col == 1:
+                cell = self._cells[row, col]
+                cell.font = header_font
+                cell.border = header_border
+                cell.alignment = header_alignment
+
+    def _append_rows(self):
+        """Streams the pending cells into the worksheet row by row."""
+        max_row = max(row for row, _ in self._cells)
+        max_col = max(col for _, col in self._cells)
+        for row in range(1, max_row + 1):
+            self.worksheet.append(
+                [self._cells.get((row, col)) for col in range(1, max_col + 1)]
+            )
+
     def _apply_column_colors(self):
         """Applies color coding to columns based on company."""
         self.worksheet.column_dimensions["A"].width = 15
 
-        column_colors = {
-            "A": ("DCE6F1", "B0C4DE"),  # Project Type
-            "B": ("EAF1DD", "A6CE39"),  # NIGEL
-            "C": ("FDEDEC", "E15B64"),  # NIRL
-            "D": ("EDE3F1", "9B6ED2"),  # NLCIL
-            "E": ("E0F2F1", "68C3A3"),  # NTPL
-            "F": ("F3E5D8", "C69C6D"),  # NUPPL
-            "G": ("EAEAEA", "D1D3D4"),  # Total
-        }
+        # Columns A-G: Project Type, then the companies and Total
+        column_colors = [PROJECT_TYPE_PALETTE, *COMPANY_PALETTE.values()]
 
-        for col_letter, (header_color, cell_color) in column_colors.items():
+        for col, (header_color, cell_color) in enumerate(column_colors, start=1):
             header_fill = PatternFill(
                 start_color=header_color, end_color=header_color, fill_type="solid"
             )
@@ -368,11 +468,11 @@ class GlimpsExcelFormatter:
                 start_color=cell_color, end_color=cell_color, fill_type="solid"
             )
 
-            for row in range(1, self.worksheet.max_row + 1):
-                cell = self.worksheet[f"{col_letter}{row}"]
-                cell.fill = header_fill if row == 1 else cell_fill
-                if row == 1:
-                    cell.font = Font(bold=True, color="000000")
+            header_cell = self._cell(1, col)
+            header_cell.fill = header_fill
+            header_cell.font = HEADER_FONT
+            for row in range(2, len(self.crosstab_df) + 2):
+                self._cell(row, col).fill = cell_fill
 
     def _add_data_validation(self):
         """Adds data validation dropdown for company selection."""
@@ -380,23 +480,23 @@ class GlimpsExcelFormatter:
         dv.prompt = "Please select a company from the list"
         dv.promptTitle = "Company List"
 
-        self.worksheet.add_data_validation(dv)
-        self.worksheet["A10"].value = "Select Company"
-        self.worksheet["A10"].font = Font(bold=True)
-        dv.add(self.worksheet["A10"])
+        self.worksheet.data_validations.append(dv)
+        self._cell(10, 1).value = "Select Company"
+        self._cell(10, 1).font = Font(bold=True)
+        dv.add("A10")
 
     def _add_dynamic_reference_section(self):
         """Adds dynamic reference section with INDEX-MATCH formulas."""
-        self.worksheet["B10"].value = "No. of Projects"
-        self.worksheet["B10"].font = Font(bold=True)
+        self._cell(10, 2).value = "No. of Projects"
+        self._cell(10, 2).font = Font(bold=True)
 
         # Copy project types to column A (rows 11-16)
         for row in range(11, 17):
-            self.worksheet[f"A{row}"].value = f"=A{row - 9}"
+            self._cell(row, 1).value = f"=A{row - 9}"
 
         # Add INDEX-MATCH formulas for dynamic data
         for row in range(11, 17):
-            self.worksheet[f"B{row}"].value = (
+            self._cell(row, 2).value = (
                 f"=INDEX($B$2:$F$7, ROW()-10, MATCH($A$10, $B$1:$F$1, 0))"
             )
 
@@ -427,15 +527,6 @@ class GlimpsExcelFormatter:
         chart.y_axis.numFmt = "0"
         chart.y_axis.tickLblPos = "nextTo"
 
-        # Apply colors to bars
-        colors = ["00FF00", "FF0000", "0000FF", "FFFF00", "FF00FF", "00FFFF"]
-        for i in range(6):
-            point = DataPoint(idx=i)
-            point.graphicalProperties.solidFill = colors[i]
-            if len(chart.series) > 0:
-                if not hasattr(chart.series[0], 'dPt'):
-                    chart.series[0].dPt = []
-
         # Chart size
         chart.width = 16
         chart.height = 10
@@ -9,37 +9,60 @@ import os
 import re
 import pandas as pd
 from pathlib import Path
-import openpyxl
-from openpyxl.styles import NamedStyle, PatternFill, Font, Border, Side
-from openpyxl.worksheet.table import Table, TableStyleInfo
-from openpyxl.utils import get_column_letter
 import logging
 
 from django.conf import settings
-from .data_processing import BaseDataProcessor, MasterDataManager
-from .formatting import BaseExcelFormatter
+from .data_processing import BaseDataProcessor, MasterDataManager, CHILD_WBS_PATTERN
+from .formatting import (
+    ReportSchema,
+    StandardReportFormatter,
+    format_indian_currency_series,
+)
 from .error_handling import handle_error
 
 
+# Level markers that may lead a WBS element's details
+_WBS_LEVEL_MARKERS = frozenset(["*", "**", "***", "4*", "5*"])
+
+# Keywords of lower-cased HTML column headers that hold text rather than
+# amounts, and of the header holding the WBS ID
+_NON_CURRENCY_COLUMN_PATTERN = re.compile(r"level|description|id|wbs|object|name")
+_ID_COLUMN_PATTERN = re.compile(r"id|wbs")
+
+# Sheet layout after 'Sl No.' is inserted: the flattened columns make one
+# header row, and currency runs from column D, where the WBS ID of summary
+# rows is found. Panes stay frozen at E3 as the report always has been
+PLAN_VARIANCE_SCHEMA = ReportSchema(
+    header_rows=(1,),
+    currency_start_col=4,
+    data_start_row=2,
+    freeze_cell="E3",
+    summary_search_col=4,
+)
+
+
 def generate_formatted_html(df, summary_wbs_list):
     """
     Generate a professionally formatted HTML table with Indian currency formatting.
     """
     # Identify currency columns (skip first few non-currency columns)
-    non_currency_cols = ['Sl No.']
-    currency_columns = []
-
-    for col in df.columns:
-        col_lower = str(col).lower()
-        if col not in non_currency_cols and not any(x in col_lower for x in ['level', 'description', 'id', 'wbs', 'object', 'name']):
-            currency_columns.append(col)
+    col_lowers = [str(col).lower() for col in df.columns]
+    currency_columns = [
+        col for col, col_lower in zip(df.columns, col_lowers)
+        if col != 'Sl No.' and not _NON_CURRENCY_COLUMN_PATTERN.search(col_lower)
+    ]
 
     # Find the ID column for highlighting summary WBS
-    id_column = None
-    for col in df.columns:
-        if 'id' in str(col).lower() or 'wbs' in str(col).lower():
-            id_column = col
-            break
+    id_column = next(
+        (col for col, col_lower in zip(df.columns, col_lowers)
+         if _ID_COLUMN_PATTERN.search(col_lower)),
+        None
+    )
+
+    # Format each currency column in one vectorised pass
+    formatted_currency = {
+        col: format_indian_currency_series(df[col]).tolist() for col in currency_columns
+    }
 
     # Build HTML table
     html_parts = []
@@ -114,35 +137,41 @@ def generate_formatted_html(df, summary_wbs_list):
     # Table body
     html_parts.append('<tbody>')
 
-    for idx, row in df.iterrows():
+    # Render every cell column by column, with each column's <td> tags built
+    # once, then stitch the rows together from plain column lists instead
+    # of building a Series per row
+    column_cells = []
+    for position, col in enumerate(df.columns):
+        if col in formatted_currency:
+            # Format as Indian currency
+            column_cells.append([
+                f'<td class="currency-cell negative">{value}</td>' if value.startswith('-')
+                else f'<td class="currency-cell">{value}</td>'
+                for value in formatted_currency[col]
+            ])
+        elif col == 'Sl No.':
+            # Center align serial numbers
+            column_cells.append([
+                f'<td class="center-cell">{value}</td>' for value in df.iloc[:, position].tolist()
+            ])
+        else:
+            # Text columns - left align
+            values = df.iloc[:, position]
+            column_cells.append([
+                f'<td class="text-cell">{value}</td>' if present else '<td class="text-cell"></td>'
+                for value, present in zip(values.tolist(), values.notna().tolist())
+            ])
+
+    summary_wbs_set = set(summary_wbs_list) if id_column and summary_wbs_list else None
+    id_values = df[id_column].tolist() if summary_wbs_set else None
+
+    for position, cells in enumerate(zip(*column_cells)):
         # Check if this row is a summary WBS
         row_class = ''
-        if id_column and summary_wbs_list:
-            wbs_value = row.get(id_column, '')
-            if wbs_value in summary_wbs_list:
-                row_class = ' class="summary-wbs"'
-
-        html_parts.append(f'<tr{row_class}>')
-
-        for col in df.columns:
-            value = row[col]
-
-            if col in currency_columns:
-                # Format as Indian currency
-                from .formatting import format_indian_currency
-                formatted_value = format_indian_currency(value)
-                cell_class = 'currency-cell'
-                if formatted_value.startswith('-'):
-                    cell_class += ' negative'
-                html_parts.append(f'<td class="{cell_class}">{formatted_value}</td>')
-            elif col == 'Sl No.':
-                # Center align serial numbers
-                html_parts.append(f'<td class="center-cell">{value}</td>')
-            else:
-                # Text columns - left align
-                html_parts.append(f'<td class="text-cell">{value if pd.notna(value) else ""}</td>')
-
-        html_parts.append('</tr>')
+        if summary_wbs_set and id_values[position] in summary_wbs_set:
+            row_class = ' class="summary-wbs"'
+
+        html_parts.append(f'<tr{row_class}>{"".join(cells)}</tr>')
 
     html_parts.append('</tbody>')
     html_parts.append('</table>')
@@ -179,32 +208,34 @@ class PlanVarianceProcessor(BaseDataProcessor):
 
     def clean_data(self, input_path: str, cleaned_path: str):
         """Clean the DAT file by removing unnecessary lines and asterisks."""
-        with open(input_path, 'r', encoding='iso-8859-1') as file:
-            lines = file.readlines()
-
-        total_lines = len(lines)
-
-        # Remove the first, fourth, and last line (0-indexed: 0, 3, total_lines-1)
-        lines_to_delete = [0, 3, total_lines - 1]
-        lines = [line for i, line in enumerate(lines) if i not in lines_to_delete]
-
-        # Replace asterisks with spaces
-        lines = [line.replace("*", " ") for line in lines]
-
-        with open(cleaned_path, 'w', encoding='iso-8859-1') as file:
-            file.writelines(lines)
+        # Stream the file, holding back one line so the last line can be
+        # dropped without reading the whole file into memory first: whatever
+        # is still pending at the end is the last line
+        pending = None
+        with open(input_path, 'r', encoding='iso-8859-1') as source, \
+                open(cleaned_path, 'w', encoding='iso-8859-1') as target:
+            for index, line in enumerate(source):
+                if pending is not None:
+                    target.write(pending)
+                    pending = None
+
+                # Remove the first and fourth line; replace asterisks with spaces
+                if index not in (0, 3):
+                    pending = line.replace("*", " ")
 
         self.logger.info(f"Data cleaned and saved to {cleaned_path}")
         return cleaned_path
 
     def process_data(self, cleaned_path: str):
         """Process the cleaned DAT file into a formatted DataFrame."""
-        # Read the DAT file with multi-level headers
+        # Read the DAT file with multi-level headers; like read_dat_file, parse
+        # in one pass rather than in chunks that each re-infer the dtypes
         self.df = pd.read_csv(
             cleaned_path,
             sep="\t",
             header=[0, 1],
-            encoding="iso-8859-1"
+            encoding="iso-8859-1",
+            low_memory=False
         )
 
         # Convert columns to tuples
@@ -222,13 +253,17 @@ class PlanVarianceProcessor(BaseDataProcessor):
 
         level, description, id_no = [], [], []
 
-        for details in split_details:
+        # A plain loop over the split tokens; the equivalent chain of pandas
+        # .str operations runs the same per-row Python work several times over.
+        # Iterating a list skips the Series iterator's per-element overhead
+        for details in split_details.tolist():
             Level = details[0]
             Description = " ".join(details[1:])
             ID = details[1]
 
-            if Level not in ["*", "**", "***", "4*", "5*"]:
-                Description = Level.strip() + Description.strip()
+            if Level not in _WBS_LEVEL_MARKERS:
+                # Tokens from split() carry no surrounding whitespace
+                Description = Level + Description
                 Level = " "
 
             level.append(Level)
@@ -262,94 +297,56 @@ class PlanVarianceProcessor(BaseDataProcessor):
 
     def process_wbs(self, wbs_list):
         """Classifies WBS elements into summary and transaction WBS dynamically."""
-        summary_wbs = []
-        transaction_wbs = []
+        wbs_series = pd.Series(wbs_list, dtype=object)
 
-        for wbs in wbs_list:
-            # Define a regular expression pattern to match a WBS element with child elements
-            pattern = re.compile(re.escape(wbs) + r"-\d{2}")
+        # A WBS element is a summary when another element extends it with a
+        # hyphen and two digits; derive those parents in one vectorised pass
+        # instead of matching every element against all the others
+        parent_wbs = set(wbs_series.str.extract(CHILD_WBS_PATTERN)[0].dropna())
 
-            # Check if any WBS starts with the parent WBS followed by a hyphen and two digits
-            has_child = any(pattern.fullmatch(item) for item in wbs_list if item != wbs)
-
-            if has_child:
-                summary_wbs.append(wbs)
-            else:
-                transaction_wbs.append(wbs)
+        is_summary = wbs_series.isin(parent_wbs)
+        summary_wbs = wbs_series[is_summary].tolist()
+        transaction_wbs = wbs_series[~is_summary].tolist()
 
         return summary_wbs, transaction_wbs
 
 
-class PlanVarianceExcelFormatter(BaseExcelFormatter):
+class PlanVarianceExcelFormatter:
     """Handles the Excel formatting for the Plan Variance Report."""
 
     def __init__(self, df: pd.DataFrame, output_file: str, summary_wbs_list: list):
         self.df = df
         self.output_file = output_file
         self.summary_wbs_list = summary_wbs_list
-        self.workbook = None
-        self.worksheet = None
         self.logger = logging.getLogger(__name__)
 
     def apply_all_formatting(self):
-        """
-        Implementation of the abstract method from BaseExcelFormatter.
-        Calls format_and_save() to apply all formatting.
-        """
+        """Alias of format_and_save(), matching the other report formatters."""
         return self.format_and_save()
 
     def format_and_save(self):
         """Apply all formatting and save the Excel file."""
-        # Flatten MultiIndex columns to strings for Excel compatibility
-        df_output = self.df.copy()
+        # Flatten MultiIndex columns to strings for Excel compatibility;
+        # a shallow copy leaves the caller's headers alone
+        df_output = self.df.copy(deep=False)
         df_output.columns = [' - '.join(col).strip() if isinstance(col, tuple) else str(col) for col in df_output.columns]
 
         # Add serial number column at the beginning
         df_output.insert(0, 'Sl No.', range(1, len(df_output) + 1))
 
-        # Save to Excel
-        df_output.to_excel(self.output_file, index=False)
-
-        # Load workbook for formatting
-        self.workbook = openpyxl.load_workbook(self.output_file)
-        self.worksheet = self.workbook.active
-
-        # Apply formatting
-        self.apply_font_style()
-        self.apply_currency_format()
-        self.adjust_column_widths()
-        self.apply_header_format()
-        self.apply_table_formatting()
-        self.highlight_summary_wbs()
-        self.apply_freeze_panes()
-
-        # Save formatted workbook
-        self.workbook.save(self.output_file)
+        # Stream the rows into a write-only workbook, styled as they are
+        # written, so the file is saved once and never read back
+        formatter = StandardReportFormatter.from_dataframe(
+            df_output,
+            self.output_file,
+            self.summary_wbs_list,
+            schema=PLAN_VARIANCE_SCHEMA,
+            module_name=__name__,
+        )
+        formatter.save()
         self.logger.info(f"Formatted Excel file saved: {self.output_file}")
         return self.output_file
 
-    def apply_freeze_panes(self):
-        """Freeze panes for the Excel sheet."""
-        self.worksheet.freeze_panes = "E3"
-
-    def highlight_summary_wbs(self):
-        """Highlight summary WBS rows in green."""
-        green_fill = PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")
-
-        # Find the ID_No column
-        id_col_index = None
-        for col_idx, cell in enumerate(self.worksheet[1], 1):
-            if 'ID' in str(cell.value) or 'WBS' in str(cell.value):
-                id_col_index = col_idx
-                break
-
-        if id_col_index and self.summary_wbs_list:
-            for row in self.worksheet.iter_rows(min_row=2, max_row=self.worksheet.max_row):
-                cell_value = row[id_col_index - 1].value
-                if cell_value in self.summary_wbs_list:
-                    for cell in row:
-                        cell.fill = green_fill
-
 
 @handle_error
 def generate_plan_variance_report(uploaded_file_path: str) -> dict:
@@ -385,14 +382,15 @@ def generate_plan_variance_report(uploaded_file_path: str) -> dict:
     output_path = str(reports_dir / output_filename)
 
     # Format and save Excel file
-    formatter = PlanVarianceExcelFormatter(df.copy(), output_path, summary_wbs)
+    formatter = PlanVarianceExcelFormatter(df, output_path, summary_wbs)
     formatted_file_path = formatter.format_and_save()
 
     # Clean up temporary file
     os.remove(cleaned_path)
 
-    # Generate HTML table from DataFrame for web display
-    df_html = df.copy()
+    # Generate HTML table from DataFrame for web display; relabelling a
+    # shallow copy leaves df alone without duplicating its data
+    df_html = df.copy(deep=False)
     df_html.columns = [' - '.join(col).strip() if isinstance(col, tuple) else str(col) for col in df_html.columns]
     df_html.insert(0, 'Sl No.', range(1, len(df_html) + 1))
 
@@ -10,6 +10,7 @@ import re
 import pandas as pd
 from pathlib import Path
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.datavalidation import DataValidation
@@ -25,6 +26,12 @@ from .error_handling import handle_error, FileProcessingError
 logger = logging.getLogger(__name__)
 
 
+# Project ID/name patterns from PROJECT_ANALYSIS_REGEX; the budget pattern
+# captures (ProjectName, ProjectID) and the plan pattern (ProjectID, ProjectName)
+_BUDGET_PROJECT_PATTERN = re.compile(settings.PROJECT_ANALYSIS_REGEX["budget"])
+_PLAN_PROJECT_PATTERN = re.compile(settings.PROJECT_ANALYSIS_REGEX["plan"])
+
+
 class ProjectAnalysisProcessor(BaseDataProcessor):
     """Processes DAT files for Project Analysis report."""
 
@@ -67,9 +74,10 @@ class ProjectAnalysisProcessor(BaseDataProcessor):
         # Remove result/summary rows
         df = df[~df.iloc[:, 0].astype(str).str.startswith("Result", na=False)]
 
-        # Extract ProjectID and ProjectName based on file type
+        # Extract ProjectID and ProjectName based on file type; the patterns
+        # capture both without surrounding whitespace, so no strip is needed
         if file_type == "budget":
-            extract_pattern = settings.PROJECT_ANALYSIS_REGEX["budget"]
+            extract_pattern = _BUDGET_PROJECT_PATTERN
             # For budget file: pattern extracts (ProjectName, ProjectID)
             df[["ProjectName", "ProjectID"]] = (
                 df[("Unnamed: 0_level_0", "Object")]
@@ -77,7 +85,7 @@ class ProjectAnalysisProcessor(BaseDataProcessor):
                 .fillna("")
             )
         else:  # plan
-            extract_pattern = settings.PROJECT_ANALYSIS_REGEX["plan"]
+            extract_pattern = _PLAN_PROJECT_PATTERN
             # For plan file: pattern extracts (ProjectID, ProjectName)
             df[["ProjectID", "ProjectName"]] = (
                 df[("Unnamed: 0_level_0", "Object")]
@@ -85,10 +93,6 @@ class ProjectAnalysisProcessor(BaseDataProcessor):
                 .fillna("")
             )
 
-        # Clean up the extracted data
-        df["ProjectID"] = df["ProjectID"].str.strip()
-        df["ProjectName"] = df["ProjectName"].str.strip()
-
         self.logger.info(f"Processed {file_type} file: {len(df)} rows")
         return df
 
@@ -98,7 +102,7 @@ def write_df_to_sheet(workbook, df, sheet_name):
     Write a DataFrame to an Excel sheet.
 
     Args:
-        workbook: openpyxl Workbook object
+        workbook: openpyxl Workbook object (may be write-only)
         df: pandas DataFrame
         sheet_name: Name for the sheet
 
@@ -107,20 +111,29 @@ def write_df_to_sheet(workbook, df, sheet_name):
     """
     ws = workbook.create_sheet(sheet_name)
 
-    # Write data to sheet
-    for r in dataframe_to_rows(df, index=False, header=True):
-        ws.append(r)
-
-    # Format header row
+    # Header row style
     header_fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
     header_font = Font(bold=True, size=12)
-
-    for cell in ws[1]:
+    header_alignment = Alignment(horizontal="center", vertical="center")
+
+    # Rows are streamed in order; the first header row is styled as it is
+    # appended, so write-only sheets never need to be revisited
+    rows = dataframe_to_rows(df, index=False, header=True)
+    header_cells = []
+    for value in next(rows):
+        cell = WriteOnlyCell(ws, value=value)
         cell.fill = header_fill
         cell.font = header_font
-        cell.alignment = Alignment(horizontal="center", vertical="center")
+        cell.alignment = header_alignment
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    row_count = 1
+    for r in rows:
+        ws.append(r)
+        row_count += 1
 
-    logger.info(f"Created sheet '{sheet_name}' with {ws.max_row} rows")
+    logger.info(f"Created sheet '{sheet_name}' with {row_count} rows")
     return ws
 
 
@@ -136,6 +149,10 @@ def create_analysis_sheet(workbook, budget_sheet, last_row, last_col_letter):
     """
     ws_analysis = workbook.create_sheet("Analysis")
 
+    # Column widths must be set before any row of a write-only sheet
+    ws_analysis.column_dimensions['A'].width = 20
+    ws_analysis.column_dimensions['B'].width = 25
+
     # ProjectID column (assumed to be in column AL based on legacy code)
     # We'll dynamically find it, but default to AL if not found
     project_id_col = "AL"
@@ -154,39 +171,39 @@ def create_analysis_sheet(workbook, budget_sheet, last_row, last_col_letter):
         allow_blank=False
     )
 
-    ws_analysis.add_data_validation(dv_project)
-    ws_analysis.add_data_validation(dv_header)
+    ws_analysis.data_validations.append(dv_project)
+    ws_analysis.data_validations.append(dv_header)
+    dv_project.add("B1")
+    dv_header.add("B2")
 
-    # Add dropdown labels and cells
-    ws_analysis["A1"] = "Select ProjectID:"
-    ws_analysis["A1"].font = Font(bold=True, size=12)
-    dv_project.add(ws_analysis["B1"])
+    # Add dropdown labels; the dropdowns themselves sit in column B
+    label_font = Font(bold=True, size=12)
+    for label in ("Select ProjectID:", "Select Year range:"):
+        cell = WriteOnlyCell(ws_analysis, value=label)
+        cell.font = label_font
+        ws_analysis.append([cell])
 
-    ws_analysis["A2"] = "Select Year range:"
-    ws_analysis["A2"].font = Font(bold=True, size=12)
-    dv_header.add(ws_analysis["B2"])
-
-    # Add analysis table headers
+    # Add analysis table headers, starting in column C
     headers = ["Plan", "Budget", "Actual", "Commitment", "Assigned", "Available"]
     header_fill = PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")
+    header_alignment = Alignment(horizontal="center")
 
-    for i, header in enumerate(headers, start=3):
-        cell = ws_analysis.cell(row=3, column=i, value=header)
+    header_cells = [None, None]
+    for header in headers:
+        cell = WriteOnlyCell(ws_analysis, value=header)
         cell.fill = header_fill
-        cell.font = Font(bold=True, size=12)
-        cell.alignment = Alignment(horizontal="center")
-
-        # Add INDEX-MATCH formula for dynamic lookup
-        formula_cell = ws_analysis.cell(row=4, column=i)
-        formula_cell.value = (
-            f'=IFERROR(INDEX(Budget!$D$2:${last_col_letter}${last_row}, '
-            f'MATCH($B$1, Budget!$C$2:$C${last_row}, 0), '
-            f'MATCH($B$2, Budget!$D$1:${last_col_letter}$1, 0)), "")'
-        )
-
-    # Set column widths
-    ws_analysis.column_dimensions['A'].width = 20
-    ws_analysis.column_dimensions['B'].width = 25
+        cell.font = label_font
+        cell.alignment = header_alignment
+        header_cells.append(cell)
+    ws_analysis.append(header_cells)
+
+    # Add INDEX-MATCH formula for dynamic lookup under every header
+    formula = (
+        f'=IFERROR(INDEX(Budget!$D$2:${last_col_letter}${last_row}, '
+        f'MATCH($B$1, Budget!$C$2:$C${last_row}, 0), '
+        f'MATCH($B$2, Budget!$D$1:${last_col_letter}$1, 0)), "")'
+    )
+    ws_analysis.append([None, None] + [formula] * len(headers))
 
     logger.info("Created Analysis sheet with interactive dropdowns")
     return ws_analysis
@@ -252,9 +269,9 @@ def generate_project_analysis_report(budget_file_path: str, plan_file_path: str)
         suffixes=("_Budget", "_Actual"),
     )
 
-    # Create Excel workbook
-    wb = openpyxl.Workbook()
-    del wb["Sheet"]  # Remove default sheet
+    # Create Excel workbook; a write-only workbook streams each sheet
+    # instead of keeping every cell in memory, and has no default sheet
+    wb = openpyxl.Workbook(write_only=True)
 
     # Write DataFrames to sheets
     logger.info("Creating Excel sheets...")
@@ -262,9 +279,10 @@ def generate_project_analysis_report(budget_file_path: str, plan_file_path: str)
     ws_actual = write_df_to_sheet(wb, df_actual, "Actual")
     ws_data = write_df_to_sheet(wb, df_combined, "Data")
 
-    # Create interactive Analysis sheet
-    last_row = ws_budget.max_row
-    last_col_letter = get_column_letter(ws_budget.max_column)
+    # Create interactive Analysis sheet; write-only sheets cannot report
+    # their size, so it is taken from the Budget frame and its header rows
+    last_row = len(df_budget) + df_budget.columns.nlevels
+    last_col_letter = get_column_letter(len(df_budget.columns))
 
     ws_analysis = create_analysis_sheet(wb, ws_budget, last_row, last_col_letter)
 
@@ -12,15 +12,49 @@ KEY FEATURES:
 """
 import os
 import pandas as pd
+from functools import lru_cache
 from pathlib import Path
-import openpyxl
+from typing import Dict
 from openpyxl.worksheet.hyperlink import Hyperlink
 from openpyxl.styles import PatternFill, Font
 from openpyxl.worksheet.table import Table, TableStyleInfo
+from openpyxl.utils import get_column_letter
 
 from django.conf import settings
 from .data_processing import BaseDataProcessor
 from .error_handling import handle_error
+from .formatting import set_default_font
+
+
+# Font of every cell in the report
+REPORT_FONT = Font(name="Bookman Old Style", size=12)
+
+# Excel has a 31 character limit on sheet names and restricts some characters
+_SHEET_NAME_LIMIT = 31
+_SHEET_NAME_TABLE = str.maketrans({'/': '-', '\\': '-', '*': '-', '?': '-', '[': None, ']': None})
+
+
+def _sheet_name(name) -> str:
+    """Sanitize a group name for use as a sheet name."""
+    return str(name)[:_SHEET_NAME_LIMIT].translate(_SHEET_NAME_TABLE)
+
+
+@lru_cache(maxsize=4)
+def _build_group_mapping(company_code_items: tuple, project_type_items: tuple) -> Dict[str, str]:
+    """Merge the company code and project type mappings for one configuration."""
+    return {**dict(company_code_items), **dict(project_type_items)}
+
+
+def _group_mapping() -> Dict[str, str]:
+    """
+    Return the token mapping used to name project groups.
+
+    The merged mapping is cached per settings values, so overridden settings
+    (e.g. in tests) still take effect. Callers must not modify it.
+    """
+    return _build_group_mapping(
+        tuple(settings.COMPANY_CODES.items()), tuple(settings.PROJECT_TYPES.items())
+    )
 
 
 def generate_formatted_html(summary_df, grouped_data):
@@ -112,14 +146,16 @@ def generate_formatted_html(summary_df, grouped_data):
     html_parts.append('</tr></thead>')
     html_parts.append('<tbody>')
 
-    for _, row in summary_df.iterrows():
-        project_name = row['Project']
-        project_count = row['Number of Unique Projects']
+    for project_name, project_count in zip(
+        summary_df['Project'].tolist(), summary_df['Number of Unique Projects'].tolist()
+    ):
         # Create anchor link to detail section
-        html_parts.append(f'<tr onclick="document.getElementById(\'{project_name}\').scrollIntoView({{behavior: \'smooth\'}})">')
-        html_parts.append(f'<td>{project_name}</td>')
-        html_parts.append(f'<td><a href="#{project_name}" class="expand-link">{project_count}</a></td>')
-        html_parts.append('</tr>')
+        html_parts.append(
+            f'<tr onclick="document.getElementById(\'{project_name}\').scrollIntoView({{behavior: \'smooth\'}})">'
+            f'<td>{project_name}</td>'
+            f'<td><a href="#{project_name}" class="expand-link">{project_count}</a></td>'
+            '</tr>'
+        )
 
     html_parts.append('</tbody></table>')
 
@@ -130,18 +166,17 @@ def generate_formatted_html(summary_df, grouped_data):
         html_parts.append('<table class="detail-table">')
 
         # Table headers
-        html_parts.append('<thead><tr>')
-        for col in group_df.columns:
-            html_parts.append(f'<th>{col}</th>')
-        html_parts.append('</tr></thead>')
+        html_parts.append(
+            '<thead><tr>' + ''.join(f'<th>{col}</th>' for col in group_df.columns) + '</tr></thead>'
+        )
 
-        # Table body
+        # Table body; each row is built as one string from a plain tuple
+        # rather than a Series per row and a list entry per cell
         html_parts.append('<tbody>')
-        for _, row in group_df.iterrows():
-            html_parts.append('<tr>')
-            for val in row:
-                html_parts.append(f'<td>{val if pd.notna(val) else ""}</td>')
-            html_parts.append('</tr>')
+        html_parts.extend(
+            '<tr>' + ''.join([f'<td>{val if pd.notna(val) else ""}</td>' for val in row]) + '</tr>'
+            for row in group_df.itertuples(index=False, name=None)
+        )
         html_parts.append('</tbody>')
 
         html_parts.append('</table>')
@@ -194,20 +229,24 @@ class ProjectTypeWiseProcessor(BaseDataProcessor):
                 f"Please ensure you're uploading CN42N output saved as Excel."
             )
 
-        # Create Group column from Project definition
-        # Example: "NL-C-001-01" -> "NL-C"
-        self.df["Group"] = self.df["Project definition"].apply(
-            lambda x: "-".join(str(x).split("-")[:2])
-        )
-
         # Map values using company codes and project types
-        company_codes = settings.COMPANY_CODES
-        project_types = settings.PROJECT_TYPES
-        mapping_dict = {**company_codes, **project_types}
-
-        self.df["Group"] = self.df["Group"].apply(
-            lambda x: "-".join([mapping_dict.get(val, val) for val in str(x).split("-")])
-        )
+        get = _group_mapping().get
+
+        # Create Group column from the mapped first two tokens of the Project
+        # definition. Example: "NL-C-001-01" -> "NL-C" -> "NLCIL-Capex"
+        # Partitioning off the two tokens in a plain loop and mapping them
+        # there is faster than a full split per row, and than pandas' .str
+        # split, map and cat
+        groups = []
+        for definition in self.df["Project definition"].tolist():
+            first, sep, rest = str(definition).partition("-")
+            first = get(first, first)
+            if sep:
+                second = rest.partition("-")[0]
+                groups.append(f"{first}-{get(second, second)}")
+            else:
+                groups.append(first)
+        self.df["Group"] = groups
 
         # Create summary
         summary = (
@@ -225,10 +264,25 @@ class ProjectTypeWiseProcessor(BaseDataProcessor):
 class ProjectTypeWiseExcelFormatter:
     """Handles the Excel formatting for the Project Type Wise Report."""
 
-    def __init__(self, df: pd.DataFrame, summary: pd.DataFrame, output_file: str):
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        summary: pd.DataFrame,
+        output_file: str,
+        groups: list = None,
+    ):
+        """
+        Args:
+            df: Project data with its Group column
+            summary: Unique project count per group
+            output_file: Path the report is saved to
+            groups: (group name, DataFrame) pairs of df grouped by Group, when
+                the caller has already grouped it
+        """
         self.df = df
         self.summary = summary
         self.output_file = output_file
+        self.groups = groups
         self.workbook = None
 
     @handle_error
@@ -236,45 +290,54 @@ class ProjectTypeWiseExcelFormatter:
         """Format and save the Excel file with multiple sheets and hyperlinks."""
         # Write to Excel with multiple sheets
         with pd.ExcelWriter(self.output_file, engine="openpyxl") as writer:
+            # Hyperlinks and formatting are added to the writer's workbook
+            # while it is still in memory; the file is written once when the
+            # writer closes instead of being saved, re-read and saved again
+            self.workbook = writer.book
+            set_default_font(self.workbook, REPORT_FONT)
+
             # Write main data
             self.df.to_excel(writer, index=False, sheet_name="ProjectsView")
 
             # Write summary
             self.summary.to_excel(writer, index=False, sheet_name="Summary")
-
-            # Write grouped data
-            grouped = self.df.groupby("Group")
+            sheet_frames = {"ProjectsView": self.df, "Summary": self.summary}
+
+            # Write grouped data; every group's sheet name is sanitized once
+            # and reused for the summary hyperlinks
+            grouped = self.groups
+            if grouped is None:
+                grouped = list(self.df.groupby("Group"))
+            sheet_names = {name: _sheet_name(name) for name, _ in grouped}
             for name, group in grouped:
-                # Sanitize sheet name (Excel has 31 char limit and restricted chars)
-                sheet_name = str(name)[:31].replace('/', '-').replace('\\', '-').replace('*', '-').replace('?', '-').replace('[', '').replace(']', '')
-                group.to_excel(writer, index=False, sheet_name=sheet_name)
-
-        # Load workbook to add hyperlinks and formatting
-        self.workbook = openpyxl.load_workbook(self.output_file)
+                group.to_excel(writer, index=False, sheet_name=sheet_names[name])
+                sheet_frames[sheet_names[name]] = group
 
-        # Add hyperlinks in summary sheet
-        self._add_hyperlinks()
+            # Add hyperlinks in summary sheet
+            self._add_hyperlinks(sheet_names)
 
-        # Format all sheets
-        for sheet_name in self.workbook.sheetnames:
-            self._format_sheet(sheet_name)
+            # Format all sheets
+            for sheet_name, sheet_df in sheet_frames.items():
+                self._format_sheet(sheet_name, sheet_df)
 
-        self.workbook.save(self.output_file)
         return self.output_file
 
-    def _add_hyperlinks(self):
-        """Add hyperlinks in the summary sheet."""
+    def _add_hyperlinks(self, sheet_names: dict):
+        """
+        Add hyperlinks in the summary sheet.
+
+        Args:
+            sheet_names: Sanitized sheet name of each group's detail sheet
+        """
         summary_sheet = self.workbook["Summary"]
 
         for row in range(2, summary_sheet.max_row + 1):
             project_name = summary_sheet.cell(row=row, column=1).value
             project_count = summary_sheet.cell(row=row, column=2).value
 
-            # Sanitize sheet name for hyperlink
-            sanitized_name = str(project_name)[:31].replace('/', '-').replace('\\', '-').replace('*', '-').replace('?', '-').replace('[', '').replace(']', '')
-
-            # Check if sheet exists
-            if sanitized_name in self.workbook.sheetnames:
+            # Link only projects that have a detail sheet
+            sanitized_name = sheet_names.get(project_name)
+            if sanitized_name is not None:
                 link = Hyperlink(
                     ref=f"B{row}",
                     location=f"'{sanitized_name}'!A1",
@@ -282,29 +345,31 @@ class ProjectTypeWiseExcelFormatter:
                 )
                 summary_sheet[f"B{row}"].hyperlink = link
                 summary_sheet[f"B{row}"].style = "Hyperlink"
+                summary_sheet[f"B{row}"].font = REPORT_FONT
 
-    def _format_sheet(self, sheet_name: str):
-        """Apply common formatting to a sheet."""
+    def _format_sheet(self, sheet_name: str, df: pd.DataFrame):
+        """
+        Apply common formatting to a sheet.
+
+        Args:
+            sheet_name: Sheet to format
+            df: DataFrame that was written to the sheet
+        """
         worksheet = self.workbook[sheet_name]
 
-        # Apply Bookman Old Style font
-        font = Font(name="Bookman Old Style", size=12)
-        for row in worksheet.iter_rows():
-            for cell in row:
-                cell.font = font
-
-        # Auto-adjust column widths
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
+        # Data cells take the workbook default font; only the header cells
+        # carry a font of their own from to_excel
+        for cell in worksheet[1]:
+            cell.font = REPORT_FONT
+
+        # Auto-adjust column widths, measured on the written DataFrame rather
+        # than by visiting every cell; missing values are written as blanks
+        for col, (header, values) in enumerate(df.items(), start=1):
+            max_length = max(
+                [len(str(header)), *(len(str(value)) for value in values.dropna().tolist())]
+            )
             adjusted_width = (max_length + 2) * 1.2
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+            worksheet.column_dimensions[get_column_letter(col)].width = adjusted_width
 
         # Add table
         last_row = worksheet.max_row
@@ -360,12 +425,14 @@ def generate_project_type_wise_report(uploaded_file_path: str) -> dict:
     reports_dir.mkdir(parents=True, exist_ok=True)
     output_path = str(reports_dir / output_filename)
 
+    # Group the projects once for both the detail sheets and the HTML
+    grouped_data = list(df.groupby("Group"))
+
     # Format and save Excel file
-    formatter = ProjectTypeWiseExcelFormatter(df, summary, output_path)
+    formatter = ProjectTypeWiseExcelFormatter(df, summary, output_path, grouped_data)
     formatted_file_path = formatter.format_and_save()
 
     # Generate HTML output
-    grouped_data = list(df.groupby("Group"))
     html_output = generate_formatted_html(summary, grouped_data)
 
     return {
@@ -6,6 +6,13 @@ from django.conf import settings
 import pandas as pd
 import tempfile
 import os
+import json
+import re
+import zipfile
+import importlib.util
+import unittest
+import warnings
+import openpyxl
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 from reports.services.data_processing import (
@@ -13,6 +20,25 @@ from reports.services.data_processing import (
     MasterDataManager,
     WBSProcessor
 )
+from reports.services import budget_variance_service
+from reports.services.budget_variance_service import (
+    BudgetVarianceExcelFormatter,
+    BudgetVarianceProcessor
+)
+from reports.services.glimps_of_projects_service import (
+    GlimpsExcelFormatter,
+    GlimpsOfProjectsProcessor,
+    generate_formatted_html_with_charts
+)
+from reports.services.plan_variance_service import (
+    PlanVarianceExcelFormatter,
+    PlanVarianceProcessor
+)
+from reports.services.project_analysis_service import ProjectAnalysisProcessor
+from reports.services.project_type_wise_service import (
+    ProjectTypeWiseExcelFormatter,
+    ProjectTypeWiseProcessor
+)
 from reports.models import WBSElement, CompanyCode, ProjectType
 
 
@@ -91,6 +117,427 @@ class BaseDataProcessorTest(TestCase):
         self.assertEqual(len(lines), 3)  # Should have 3 lines left
 
 
+class GlimpsOfProjectsProcessorTest(TestCase):
+    """Tests for GlimpsOfProjectsProcessor class."""
+
+    def setUp(self):
+        """Set up a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test files."""
+        for file in Path(self.temp_dir).glob('*'):
+            file.unlink()
+        os.rmdir(self.temp_dir)
+
+    def test_process_data_matches_once_per_line(self):
+        """Test that project IDs are read like a line-by-line search."""
+        test_file = os.path.join(self.temp_dir, 'projects.dat')
+        with open(test_file, 'wb') as f:
+            f.write(
+                b"Header\r\n"
+                b"PRJ AB-C123 PRJ AB-C999\r\n"  # only the first ID counts
+                b"PRJ\r\n"                       # no ID on this line
+                b"  PRJ CD-X7\rPRJ AB\n"
+            )
+
+        processor = GlimpsOfProjectsProcessor(test_file, keep_project_data=True)
+        crosstab_df = processor.process_data(test_file)
+
+        self.assertEqual(
+            processor.project_data["Project ID"].tolist(),
+            ["AB-C123", "CD-X7", "AB"]
+        )
+        pd.testing.assert_frame_equal(
+            crosstab_df,
+            pd.crosstab(
+                processor.project_data["Project Type"],
+                processor.project_data["Company"],
+                margins=True,
+                margins_name="Total"
+            )
+        )
+
+    def test_process_data_without_projects(self):
+        """Test that a file without project IDs is rejected."""
+        test_file = os.path.join(self.temp_dir, 'empty.dat')
+        Path(test_file).touch()
+
+        processor = GlimpsOfProjectsProcessor(test_file)
+        with self.assertRaises(ValueError):
+            processor.process_data(test_file)
+
+    def test_chart_script_embeds_json(self):
+        """Test that the chart data is embedded in the script as JSON."""
+        crosstab_df = pd.crosstab(
+            pd.Series(["Capex", "Opex", "Capex"], name="Project Type"),
+            pd.Series(["NIGEL", "NIRL", "NIRL"], name="Company"),
+            margins=True,
+            margins_name="Total"
+        )
+
+        script = generate_formatted_html_with_charts(crosstab_df)['script']
+
+        project_types = re.search(r"const projectTypes = (.*);", script).group(1)
+        chart_data = re.search(r"const chartData = (.*);", script).group(1)
+        self.assertEqual(json.loads(project_types), ["Capex", "Opex"])
+        self.assertEqual(json.loads(chart_data), {"NIGEL": [1, 0], "NIRL": [1, 1]})
+
+    def test_excel_formatter_output(self):
+        """Test the styled crosstab, reference section and chart in the workbook."""
+        crosstab_df = pd.crosstab(
+            pd.Series(["Capex", "Opex", "Capex"], name="Project Type"),
+            pd.Series(["NIGEL", "NIRL", "NIRL"], name="Company"),
+            margins=True,
+            margins_name="Total"
+        )
+        output_file = os.path.join(self.temp_dir, 'glimps.xlsx')
+        GlimpsExcelFormatter(crosstab_df, output_file).format_and_save()
+
+        with zipfile.ZipFile(output_file) as archive:
+            self.assertIn('xl/charts/chart1.xml', archive.namelist())
+
+        worksheet = openpyxl.load_workbook(output_file).active
+        self.assertEqual(
+            [cell.value for cell in worksheet[1]][:4],
+            ["Project Type", "NIGEL", "NIRL", "Total"]
+        )
+        self.assertEqual(worksheet["B2"].value, 1)
+        self.assertEqual(worksheet["B1"].fill.fgColor.rgb, "00EAF1DD")
+        self.assertEqual(worksheet["B2"].fill.fgColor.rgb, "00A6CE39")
+        self.assertTrue(worksheet["A2"].font.b)
+        self.assertEqual(worksheet["A2"].border.left.style, "thin")
+        self.assertEqual(worksheet["A11"].value, "=A2")
+        self.assertEqual(worksheet.column_dimensions["A"].width, 15)
+        self.assertEqual(
+            str(worksheet.data_validations.dataValidation[0].sqref), "A10"
+        )
+
+
+class PlanVarianceProcessorTest(TestCase):
+    """Tests for PlanVarianceProcessor class."""
+
+    def test_process_wbs(self):
+        """Test that elements with a direct '-NN' child are summaries."""
+        processor = PlanVarianceProcessor('plan.dat')
+        wbs_list = ["P-100", "P-100-01", "P-100-01-01", "P-100-1", "P-200", "P-100"]
+
+        summary_wbs, transaction_wbs = processor.process_wbs(wbs_list)
+
+        self.assertEqual(summary_wbs, ["P-100", "P-100-01", "P-100"])
+        self.assertEqual(transaction_wbs, ["P-100-01-01", "P-100-1", "P-200"])
+
+    def test_clean_data(self):
+        """Test that the first, fourth and last lines go and asterisks become spaces."""
+        temp_dir = tempfile.mkdtemp()
+        input_file = os.path.join(temp_dir, 'input.dat')
+        output_file = os.path.join(temp_dir, 'output.dat')
+        with open(input_file, 'w', encoding='iso-8859-1') as f:
+            f.write("Title\nHead 1\nHead 2\n----\n** WBS A\n*** WBS B\nFooter\n")
+
+        try:
+            PlanVarianceProcessor(input_file).clean_data(input_file, output_file)
+            with open(output_file, 'r', encoding='iso-8859-1') as f:
+                lines = f.read().splitlines()
+        finally:
+            for file in Path(temp_dir).glob('*'):
+                file.unlink()
+            os.rmdir(temp_dir)
+
+        self.assertEqual(lines, ["Head 1", "Head 2", "   WBS A", "    WBS B"])
+
+
+class BudgetVarianceProcessorTest(TestCase):
+    """Tests for BudgetVarianceProcessor class."""
+
+    HTML = (
+        "<table>"
+        "<tr><th>WBS</th><th>Text</th><th>Budget</th></tr>"
+        "<tr><th>Element1</th><th>Description1</th><th>2024</th></tr>"
+        "<tr><td>P-100</td><td>Project</td><td>1500</td></tr>"
+        "</table>"
+    )
+
+    def setUp(self):
+        """Write the HTML table to a temporary file."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.html_file = os.path.join(self.temp_dir, 'budget.html')
+        with open(self.html_file, 'w', encoding='utf-8') as f:
+            f.write(self.HTML)
+        self.processor = BudgetVarianceProcessor(self.html_file)
+
+    def tearDown(self):
+        """Clean up test files."""
+        os.remove(self.html_file)
+        os.rmdir(self.temp_dir)
+
+    @unittest.skipUnless(
+        importlib.util.find_spec('lxml') or importlib.util.find_spec('bs4'),
+        "pandas.read_html needs lxml or beautifulsoup4"
+    )
+    def test_read_html_data_flattens_headers(self):
+        """Test that the two header rows are joined into one column name."""
+        df = self.processor.read_html_data(self.html_file)
+
+        self.assertEqual(df.columns.tolist(), ["WBS Element1", "Text Description1", "Budget 2024"])
+        self.assertEqual(df.iloc[0].tolist(), ["P-100", "Project", 1500])
+
+    @unittest.skipUnless(
+        importlib.util.find_spec('lxml') or importlib.util.find_spec('bs4'),
+        "pandas.read_html needs lxml or beautifulsoup4"
+    )
+    def test_read_html_data_without_lxml(self):
+        """Test that pandas picks the parser when lxml is not installed."""
+        with patch.object(budget_variance_service, 'READ_HTML_FLAVOR', None), \
+                patch('pandas.read_html', wraps=pd.read_html) as read_html:
+            df = self.processor.read_html_data(self.html_file)
+
+        self.assertIsNone(read_html.call_args.kwargs['flavor'])
+        self.assertEqual(df.columns.tolist(), ["WBS Element1", "Text Description1", "Budget 2024"])
+
+
+class BudgetVarianceExcelFormatterTest(TestCase):
+    """Tests for BudgetVarianceExcelFormatter class."""
+
+    def setUp(self):
+        """Set up a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test files."""
+        for file in Path(self.temp_dir).glob('*'):
+            file.unlink()
+        os.rmdir(self.temp_dir)
+
+    def test_format_and_save(self):
+        """Test that the write-only sheet is formatted as it is written."""
+        df = pd.DataFrame({
+            "WBS Element1": ["P-100", "P-100-01", "P-100-02"],
+            "Description1": ["Project", "Stage with a longer description", None],
+            "Budget 20241": [1500.0, -250.5, None],
+            "Remarks": [125.0, "n/a", None],
+        })
+        output_file = os.path.join(self.temp_dir, 'budget.xlsx')
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            BudgetVarianceExcelFormatter(df, output_file).format_and_save(["P-100"])
+        self.assertEqual(caught, [])
+
+        # The caller's frame keeps its headers
+        self.assertEqual(df.columns[0], "WBS Element1")
+
+        worksheet = openpyxl.load_workbook(output_file)['Budget Variance']
+        self.assertEqual(
+            [cell.value for cell in worksheet[1]],
+            ["WBS Element", "Description", "Budget 2024", "Remarks"]
+        )
+        self.assertEqual(worksheet.freeze_panes, "D3")
+        self.assertEqual(worksheet["A1"].fill.fgColor.rgb, "00FFFF00")
+        self.assertTrue(worksheet["A1"].font.b)
+        self.assertEqual(worksheet["A1"].border.left.style, "thin")
+
+        # Numbers from the third column on are currency, including those in
+        # a column that also holds text
+        self.assertEqual(worksheet["C2"].number_format, settings.CURRENCY_FORMAT)
+        self.assertEqual(worksheet["C3"].number_format, settings.CURRENCY_FORMAT)
+        self.assertEqual(worksheet["D2"].number_format, settings.CURRENCY_FORMAT)
+        self.assertEqual(worksheet["D3"].number_format, "General")
+        self.assertEqual(worksheet["B2"].number_format, "General")
+        self.assertEqual(worksheet["A2"].font.name, "Bookman Old Style")
+
+        # Only the summary WBS row is orange, blank cells included
+        self.assertEqual(
+            [cell.fill.fgColor.rgb for cell in worksheet[2]], ["00FFA500"] * 4
+        )
+        self.assertIsNone(worksheet["A3"].fill.fill_type)
+        self.assertIsNone(worksheet["D4"].value)
+
+        # Widths follow the longest header or value plus padding
+        self.assertEqual(worksheet.column_dimensions["A"].width, len("WBS Element") + 10)
+        self.assertEqual(
+            worksheet.column_dimensions["B"].width,
+            len("Stage with a longer description") + 10
+        )
+        self.assertEqual(worksheet.column_dimensions["D"].width, len("Remarks") + 10)
+
+        table = worksheet.tables["Table1"]
+        self.assertEqual(table.ref, "A1:D4")
+        self.assertEqual(
+            [column.name for column in table.tableColumns],
+            ["WBS Element", "Description", "Budget 2024", "Remarks"]
+        )
+        self.assertEqual(table.tableStyleInfo.name, "TableStyleMedium9")
+
+
+class PlanVarianceExcelFormatterTest(TestCase):
+    """Tests for PlanVarianceExcelFormatter class."""
+
+    def setUp(self):
+        """Set up a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test files."""
+        for file in Path(self.temp_dir).glob('*'):
+            file.unlink()
+        os.rmdir(self.temp_dir)
+
+    def test_format_and_save(self):
+        """Test that the report is styled in the single write."""
+        df = pd.DataFrame({
+            ("WBS_Elements_Info.", "Level"): ["*", "**", "**"],
+            ("WBS_Elements_Info.", "Description"): ["Project", "Stage", "Task"],
+            ("WBS_Elements_Info.", "ID_No"): ["P-100", "P-100-01", "P-100-02"],
+            ("Plan", "2024"): [1500.0, -250.0, 0.0],
+        })
+        output_file = os.path.join(self.temp_dir, 'plan.xlsx')
+
+        with patch('openpyxl.load_workbook') as load_workbook:
+            PlanVarianceExcelFormatter(df, output_file, ["P-100-01"]).format_and_save()
+            load_workbook.assert_not_called()
+
+        # The caller's frame is not relabelled or extended
+        self.assertEqual(df.columns[0], ("WBS_Elements_Info.", "Level"))
+        self.assertEqual(df.shape, (3, 4))
+
+        worksheet = openpyxl.load_workbook(output_file).active
+        self.assertEqual(
+            [cell.value for cell in worksheet[1]],
+            ["Sl No.", "WBS_Elements_Info. - Level", "WBS_Elements_Info. - Description",
+             "WBS_Elements_Info. - ID_No", "Plan - 2024"]
+        )
+        self.assertEqual(worksheet.freeze_panes, "E3")
+        self.assertEqual(worksheet["A1"].fill.fgColor.rgb, "00FFFF00")
+        self.assertTrue(worksheet["A1"].font.b)
+        # The first record sits right under the single header row
+        self.assertEqual(worksheet["A2"].value, 1)
+        self.assertNotEqual(worksheet["A2"].style, "header_style")
+        self.assertFalse(worksheet["A2"].font.b)
+        self.assertEqual(worksheet["A2"].fill.fgColor.rgb, "0087CEEB")
+        self.assertEqual(worksheet["E2"].style, "currency_style")
+        self.assertEqual(worksheet["E2"].number_format, settings.CURRENCY_FORMAT)
+        self.assertEqual(worksheet["A3"].font.name, "Bookman Old Style")
+        self.assertEqual(worksheet["E3"].number_format, settings.CURRENCY_FORMAT)
+        self.assertEqual(worksheet["E3"].fill.fgColor.rgb, "0090EE90")
+        self.assertEqual(worksheet["A4"].fill.fgColor.rgb, "0087CEEB")
+        self.assertEqual(worksheet["A4"].border.left.style, "thin")
+
+
+class ProjectAnalysisProcessorTest(TestCase):
+    """Tests for ProjectAnalysisProcessor class."""
+
+    def test_process_data_extracts_trimmed_values(self):
+        """Test that project IDs and names come out without padding."""
+        temp_dir = tempfile.mkdtemp()
+        test_file = os.path.join(temp_dir, 'projects.dat')
+        with open(test_file, 'w', encoding='iso-8859-1') as f:
+            f.write(
+                "\tTotal\n"
+                "Object\tBudget\n"
+                "6*  Solar Plant   PRJ  AB-123456789  \t10\n"
+                "6* PRJ AB-123456789 Wind Farm  \t5\n"
+                "Result\t15\n"
+            )
+
+        try:
+            processor = ProjectAnalysisProcessor()
+            budget_df = processor.process_data(test_file, "budget")
+            plan_df = processor.process_data(test_file, "plan")
+        finally:
+            os.remove(test_file)
+            os.rmdir(temp_dir)
+
+        self.assertEqual(budget_df["ProjectID"].tolist(), ["AB-123456789", "AB-123456789 Wind Farm"])
+        self.assertEqual(budget_df["ProjectName"].tolist(), ["Solar Plant", ""])
+        self.assertEqual(plan_df["ProjectID"].tolist(), ["", "AB-123456789"])
+        self.assertEqual(plan_df["ProjectName"].tolist(), ["", "Wind Farm"])
+
+
+class ProjectTypeWiseProcessorTest(TestCase):
+    """Tests for ProjectTypeWiseProcessor class."""
+
+    def test_process_data_groups(self):
+        """Test that projects are grouped by their mapped first two tokens."""
+        temp_dir = tempfile.mkdtemp()
+        test_file = os.path.join(temp_dir, 'projects.xlsx')
+        pd.DataFrame({
+            "Project definition": ["NL-C-BSP-001", "NL-C-BSP-002", "XX-Q", "SOLO", "NL-"]
+        }).to_excel(test_file, index=False)
+
+        try:
+            processor = ProjectTypeWiseProcessor(test_file)
+            df, summary = processor.process_data(test_file)
+        finally:
+            os.remove(test_file)
+            os.rmdir(temp_dir)
+
+        self.assertEqual(
+            df["Group"].tolist(),
+            ["NLCIL-Capex", "NLCIL-Capex", "XX-Q", "SOLO", "NLCIL-"]
+        )
+        self.assertEqual(
+            dict(zip(summary["Project"], summary["Number of Unique Projects"])),
+            {"NLCIL-": 1, "NLCIL-Capex": 2, "SOLO": 1, "XX-Q": 1}
+        )
+
+    def test_process_data_uses_current_mappings(self):
+        """Test that the cached group mapping follows overridden settings."""
+        temp_dir = tempfile.mkdtemp()
+        test_file = os.path.join(temp_dir, 'projects.xlsx')
+        pd.DataFrame({"Project definition": ["NL-C-BSP-001"]}).to_excel(test_file, index=False)
+
+        try:
+            processor = ProjectTypeWiseProcessor(test_file)
+            processor.process_data(test_file)
+            with self.settings(COMPANY_CODES={"NL": "Neyveli"}):
+                df, _ = processor.process_data(test_file)
+        finally:
+            os.remove(test_file)
+            os.rmdir(temp_dir)
+
+        self.assertEqual(df["Group"].tolist(), ["Neyveli-Capex"])
+
+
+class ProjectTypeWiseExcelFormatterTest(TestCase):
+    """Tests for ProjectTypeWiseExcelFormatter class."""
+
+    def setUp(self):
+        """Set up a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test files."""
+        for file in Path(self.temp_dir).glob('*'):
+            file.unlink()
+        os.rmdir(self.temp_dir)
+
+    def test_format_and_save(self):
+        """Test the group sheets and the summary links to them."""
+        df = pd.DataFrame({
+            "Project definition": ["NL-C-001", "NL-C-002", "AB-X-001"],
+            "Group": ["NL/C*[1]", "NL/C*[1]", "AB-X"],
+        })
+        summary = pd.DataFrame({
+            "Project": ["AB-X", "NL/C*[1]"],
+            "Number of Unique Projects": [1, 2],
+        })
+        output_file = os.path.join(self.temp_dir, 'projects.xlsx')
+
+        ProjectTypeWiseExcelFormatter(df, summary, output_file).format_and_save()
+
+        workbook = openpyxl.load_workbook(output_file)
+        self.assertEqual(
+            workbook.sheetnames, ["ProjectsView", "Summary", "AB-X", "NL-C-1"]
+        )
+        summary_sheet = workbook["Summary"]
+        self.assertEqual(summary_sheet["B2"].hyperlink.location, "'AB-X'!A1")
+        self.assertEqual(summary_sheet["B3"].hyperlink.location, "'NL-C-1'!A1")
+        self.assertEqual(workbook["NL-C-1"].max_row, 3)
+        self.assertEqual(workbook["NL-C-1"]["A2"].font.name, "Bookman Old Style")
+        self.assertEqual(workbook["NL-C-1"].freeze_panes, "A2")
+
+
 class MasterDataManagerTest(TestCase):
     """Tests for MasterDataManager class."""
 
@@ -142,6 +589,55 @@ class MasterDataManagerTest(TestCase):
         # P-999 doesn't exist, should remain empty
         self.assertEqual(result_df.loc[2, ('WBS', 'Description')], "")
 
+    def test_map_wbs_descriptions_without_matches(self):
+        """Test that descriptions are left alone when no WBS is in the master data."""
+        test_df = pd.DataFrame({
+            ('WBS', 'Code'): ['P-998', 'P-999'],
+            ('WBS', 'Description'): ['Existing', '']
+        })
+
+        result_df = self.manager.map_wbs_descriptions(
+            transaction_df=test_df,
+            wbs_column=('WBS', 'Code'),
+            description_column=('WBS', 'Description')
+        )
+
+        self.assertEqual(result_df[('WBS', 'Description')].tolist(), ['Existing', ''])
+
+    def test_map_wbs_descriptions_reuses_cached_mapping(self):
+        """Test that repeated mappings skip reloading the master data."""
+        def make_df():
+            return pd.DataFrame({
+                ('WBS', 'Code'): ['P-001'],
+                ('WBS', 'Description'): ['']
+            })
+
+        self.manager.map_wbs_descriptions(make_df(), ('WBS', 'Code'), ('WBS', 'Description'))
+
+        # Only the master data version check should hit the database
+        with self.assertNumQueries(1):
+            result_df = self.manager.map_wbs_descriptions(
+                make_df(), ('WBS', 'Code'), ('WBS', 'Description')
+            )
+        self.assertEqual(result_df.loc[0, ('WBS', 'Description')], "Project One")
+
+        # Editing an element in place moves the version token, so the
+        # mapping is reloaded without any in-process invalidation
+        element = WBSElement.objects.get(wbs_element="P-001")
+        element.name = "Renamed"
+        element.save()
+        result_df = self.manager.map_wbs_descriptions(
+            make_df(), ('WBS', 'Code'), ('WBS', 'Description')
+        )
+        self.assertEqual(result_df.loc[0, ('WBS', 'Description')], "Renamed")
+
+        # Deleting an element is seen as well
+        element.delete()
+        result_df = self.manager.map_wbs_descriptions(
+            make_df(), ('WBS', 'Code'), ('WBS', 'Description')
+        )
+        self.assertEqual(result_df.loc[0, ('WBS', 'Description')], "")
+
     def test_map_wbs_descriptions_no_data(self):
         """Test mapping WBS descriptions when no data in database."""
         # Clear all WBS elements
@@ -203,6 +699,15 @@ class WBSProcessorTest(TestCase):
         self.assertIn("P-100-02", transaction_wbs)
         self.assertIn("P-200", transaction_wbs)
 
+    def test_classify_nested_wbs_elements(self):
+        """Test that only direct children mark an element as summary."""
+        wbs_list = ["P-100", "P-100-01", "P-100-01-01", "P-200-01-01", "P-100"]
+
+        summary_wbs, transaction_wbs = self.processor.classify_wbs_elements(wbs_list)
+
+        self.assertEqual(summary_wbs, ["P-100", "P-100-01"])
+        self.assertEqual(transaction_wbs, ["P-100-01-01", "P-200-01-01"])
+
     def test_classify_empty_wbs_list(self):
         """Test classification with empty WBS list."""
         summary_wbs, transaction_wbs = self.processor.classify_wbs_elements([])
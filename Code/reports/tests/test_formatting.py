@@ -2,14 +2,20 @@
 Tests for formatting functions and classes.
 """
 from django.test import TestCase
+from django.conf import settings
 import pandas as pd
 import openpyxl
 from pathlib import Path
 import tempfile
 import os
+from unittest.mock import patch, PropertyMock
+from openpyxl.worksheet.worksheet import Worksheet
+from reports.services.error_handling import FileProcessingError
 from reports.services.formatting import (
     format_indian_currency,
+    format_indian_currency_series,
     BaseExcelFormatter,
+    ReportSchema,
     StandardReportFormatter,
     AnalyticsReportFormatter
 )
@@ -78,6 +84,18 @@ class IndianCurrencyFormatTest(TestCase):
         result = format_indian_currency(None)
         self.assertEqual(result, "")  # Returns empty string for None
 
+    def test_format_series_matches_scalar(self):
+        """Test that the vectorised formatter matches the scalar one."""
+        values = pd.Series(
+            [0, 500, -5000, 150000, 1234567890, 123456.789, -0.001, None, "", "5000", "not a number"],
+            index=range(10, 21),
+        )
+
+        result = format_indian_currency_series(values)
+
+        self.assertEqual(list(result.index), list(values.index))
+        self.assertEqual(result.tolist(), [format_indian_currency(v) for v in values])
+
 
 class StandardReportFormatterTest(TestCase):
     """Tests for StandardReportFormatter class."""
@@ -139,6 +157,119 @@ class StandardReportFormatterTest(TestCase):
         self.assertIsNotNone(wb)
         self.assertIsInstance(wb, openpyxl.Workbook)
 
+    def test_apply_all_formatting(self):
+        """Test that headers and amounts get their named styles."""
+        self.test_df.to_excel(self.output_file, index=False)
+
+        formatter = StandardReportFormatter(self.output_file)
+        formatter.apply_all_formatting()
+        formatter.apply_currency_formatting(start_col=2)
+        formatter.save()
+
+        wb = openpyxl.load_workbook(self.output_file)
+        ws = wb.active
+        self.assertEqual(ws['A1'].style, "header_style")
+        self.assertEqual(ws['B3'].style, "currency_style")
+        self.assertEqual(ws['B3'].number_format, settings.CURRENCY_FORMAT)
+        self.assertEqual(ws['A3'].font.name, settings.EXCEL_FONT["name"])
+        wb.close()
+
+    def test_formatting_step_errors_are_wrapped(self):
+        """Test that a public formatting step raises the report error types."""
+        formatter = StandardReportFormatter(self.output_file)
+
+        with self.assertRaises(FileProcessingError) as context:
+            formatter.apply_header_formatting()
+        self.assertEqual(context.exception.error_code, "FILE_NOT_FOUND")
+
+    def test_apply_all_formatting_with_schema(self):
+        """Test that a known layout is used without measuring the sheet."""
+        self.test_df.to_excel(self.output_file, index=False)
+        schema = ReportSchema(
+            num_columns=3,
+            header_rows=(1,),
+            currency_start_col=2,
+            data_start_row=2,
+            freeze_cell="B2",
+        )
+
+        formatter = StandardReportFormatter(self.output_file, schema=schema)
+        formatter.workbook
+        with patch.object(Worksheet, 'max_column', new_callable=PropertyMock) as max_column:
+            formatter.apply_all_formatting()
+            max_column.assert_not_called()
+        formatter.save()
+
+        wb = openpyxl.load_workbook(self.output_file)
+        ws = wb.active
+        self.assertEqual(ws.freeze_panes, "B2")
+        self.assertEqual(ws['C1'].style, "header_style")
+        self.assertEqual(ws['B2'].style, "currency_style")
+        self.assertNotEqual(ws['A2'].style, "header_style")
+        wb.close()
+
+    def test_from_dataframe_matches_apply_all_formatting(self):
+        """Test that the streamed report is styled like a formatted one."""
+        df = pd.DataFrame({
+            'Project': ['Alpha', 'Beta', 'Gamma', 'Delta'],
+            'Code': ['A', 'B', 'C', 'D'],
+            'Region': ['N', None, 'S', 'E'],
+            'WBS': ['P1', 'P2', 'P3', 'P4'],
+            'Budget': [1000.5, 0, -250.0, None],
+        })
+        streamed_file = os.path.join(self.temp_dir, 'streamed.xlsx')
+
+        df.to_excel(self.output_file, index=False)
+        formatter = StandardReportFormatter(self.output_file)
+        formatter.apply_all_formatting(['P3'])
+        formatter.save()
+        StandardReportFormatter.from_dataframe(df, streamed_file, ['P3']).save()
+
+        try:
+            expected = openpyxl.load_workbook(self.output_file).active
+            streamed = openpyxl.load_workbook(streamed_file).active
+            self.assertEqual(streamed.freeze_panes, expected.freeze_panes)
+            for expected_row, streamed_row in zip(expected.iter_rows(), streamed.iter_rows()):
+                for expected_cell, streamed_cell in zip(expected_row, streamed_row):
+                    self.assertEqual(streamed_cell.value, expected_cell.value)
+                    self.assertEqual(streamed_cell.style, expected_cell.style)
+                    self.assertEqual(
+                        streamed_cell.fill.fgColor.rgb, expected_cell.fill.fgColor.rgb
+                    )
+                    self.assertEqual(
+                        streamed_cell.border.left.style, expected_cell.border.left.style
+                    )
+                    self.assertEqual(streamed_cell.font.name, expected_cell.font.name)
+                    self.assertEqual(streamed_cell.font.b, expected_cell.font.b)
+            for letter, dimension in expected.column_dimensions.items():
+                self.assertEqual(streamed.column_dimensions[letter].width, dimension.width)
+        finally:
+            os.remove(streamed_file)
+
+    def test_in_memory_workbook(self):
+        """Test that a workbook built in memory is used without reading the file."""
+        wb = openpyxl.Workbook()
+        wb.active.append(['Project', 'Budget'])
+
+        # The output file does not exist yet, so it must not be loaded
+        formatter = StandardReportFormatter(self.output_file, workbook=wb)
+
+        self.assertIs(formatter.workbook, wb)
+        self.assertIn("header_style", wb.named_styles)
+        self.assertFalse(os.path.exists(self.output_file))
+
+    def test_named_styles_per_workbook(self):
+        """Test that each workbook gets its own copy of the named styles."""
+        first, second = openpyxl.Workbook(), openpyxl.Workbook()
+        StandardReportFormatter(self.output_file, workbook=first)
+        StandardReportFormatter(self.output_file, workbook=second)
+
+        first_style = first._named_styles["header_style"]
+        second_style = second._named_styles["header_style"]
+        self.assertIsNot(first_style, second_style)
+        self.assertIs(first_style._wb, first)
+        self.assertEqual(first_style.font, second_style.font)
+
 
 class AnalyticsReportFormatterTest(TestCase):
     """Tests for AnalyticsReportFormatter class."""
@@ -198,3 +329,28 @@ class AnalyticsReportFormatterTest(TestCase):
         except Exception:
             # Data validation might not work in all contexts
             pass
+
+    def test_from_dataframe(self):
+        """Test building a styled report straight from a DataFrame."""
+        df = pd.DataFrame({
+            'Category': ['A', 'B', 'C'],
+            'Code': ['X1', 'X2', 'X3'],
+            'Region': ['North', 'South', None],
+            'Value': [100, 0, 300]
+        })
+
+        formatter = AnalyticsReportFormatter.from_dataframe(df, self.output_file)
+        formatter.create_3d_chart("Values", "Sheet1!D1:D4", "Sheet1!A2:A4")
+        formatter.save()
+
+        wb = openpyxl.load_workbook(self.output_file)
+        ws = wb.active
+        self.assertEqual(ws['A1'].style, "header_style")
+        self.assertEqual(ws['D2'].style, "currency_style")
+        self.assertEqual(ws['D3'].style, "Normal")
+        self.assertIsNone(ws['C4'].value)
+        self.assertEqual(ws['A2'].font.name, settings.EXCEL_FONT["name"])
+        self.assertEqual(ws.freeze_panes, "D3")
+        self.assertEqual(ws.tables["AnalyticsTable"].ref, "A1:D4")
+        self.assertEqual(len(ws._charts), 1)
+        wb.close()